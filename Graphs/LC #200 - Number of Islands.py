@@ -115,4 +115,649 @@ Notes:
 - Could use DFS instead of BFS—same complexity, just different traversal order.
 - In-place marking (changing '1' to '0') saves space but modifies input.
 - Tuple (r,c) in visit set since lists aren't hashable.
-"""
\ No newline at end of file
+"""
+
+"""
+Follow-up: Bitmap Grid Engine (bytearray Land Mask, In-Place Visited Marks)
+---------------------------------------------------------------------------
+Problem:
+- `visit` is a set of (r, c) tuples: every land cell costs a tuple, two ints and a hash-set slot (well over
+  100 bytes), and every probe hashes a tuple. `nr in range(rows)` builds a range object per check.
+  A 20000 x 20000 raster would need tens of GB for the set alone.
+
+Logic and Approach:
+1. Land Mask (`pack_grid`):
+   - One bytearray with a byte per cell (1 = unvisited land, 0 = water), row r at `(r + 1) * width`.
+   - The grid gets a one-cell ring of water, so width = cols + 2 and cell (r, c) is index
+     `(r + 1) * width + (c + 1)`. The four neighbours of index i are then always `i - 1, i + 1,
+     i - width, i + width`, and no bounds check is needed at all.
+   - Rows are converted in C: `''.join(row)` (or the row's str / bytes as given), then `bytes.translate`
+     maps b'1' to 1 and everything else to 0.
+2. Flood Fill (`island_areas`):
+   - `mask.find(1, start)` jumps to the next unvisited land cell in C, skipping water without a Python loop.
+   - Depth-first flood with a list of plain int indices; a cell is marked visited by zeroing its byte, so
+     the mask is its own visited set.
+   - Yields each island's area, so `num_islands_bitmap` (count) and the area queries share one pass.
+3. `BitmapSolution.numIslands` gives the same answer as `Solution.numIslands` without modifying `grid`.
+
+Time and Space Complexity:
+- Time: O(rows * cols), with the water scan in C.
+- Space: (rows + 2) * (cols + 2) bytes for the mask, plus the flood stack (at most the island's size).
+
+Benchmark (`benchmark_bitmap`, random grids, land density 0.4, CPython 3.11):
+- 1000^2:  numIslands 1.61 s, peak 55.9 B/cell | bitmap 0.21 s (7.7x), peak 1.04 B/cell
+- 5000^2:  numIslands 49.2 s | bitmap 6.43 s (7.6x)
+- 20000^2: numIslands not run (at 55.9 B/cell the visit set alone would need ~22 GB, extrapolated) |
+  bitmap 92.1 s, 42.1M islands, mask 400 MB (rows streamed in as bytes; a list-of-lists grid of this
+  size would itself need 3.2 GB of pointers)
+- Most of the remaining time is the per-cell flood loop in Python; on sparse rasters `find` skips water
+  at C speed.
+"""
+import random
+import time
+import tracemalloc
+
+LAND = bytes(1 if byte == ord('1') else 0 for byte in range(256))  # translate() table: b'1' -> 1, else 0
+
+
+def pack_grid(grid) -> tuple:
+    """
+    Pack a grid into a water-padded land mask.
+
+    Args:
+        grid (Iterable): Rows as lists of '1' / '0' strings (the `numIslands` format), str, or bytes.
+    Returns:
+        Tuple[bytearray, int]: (mask, width); cell (r, c) is mask[(r + 1) * width + c + 1].
+    Raises:
+        ValueError: If the rows do not all have the same length.
+    """
+    mask, width = bytearray(), 0
+    for r, row in enumerate(grid):
+        if isinstance(row, list):
+            row = ''.join(row)
+        if isinstance(row, str):
+            row = row.encode('ascii')
+        if not mask:
+            width = len(row) + 2
+            mask += bytes(width)  # Top water row
+        elif len(row) != width - 2:  # A short row would shift every later row in the flat mask
+            raise ValueError(f"Row {r} has {len(row)} cells, expected {width - 2}")
+        mask += b'\x00' + row.translate(LAND) + b'\x00'
+    mask += bytes(width)  # Bottom water row
+    return mask, width
+
+
+def island_areas(mask: bytearray, width: int):
+    """
+    Yield the area of every island in a packed mask, in scan order. Consumes the mask: visited land is
+    zeroed in place.
+    """
+    i = mask.find(1)
+    while i != -1:
+        mask[i] = 0
+        stack, area = [i], 0
+        while stack:
+            j = stack.pop()
+            area += 1
+            for k in (j - 1, j + 1, j - width, j + width):
+                if mask[k]:
+                    mask[k] = 0
+                    stack.append(k)
+        yield area
+        i = mask.find(1, i + 1)
+
+
+def num_islands_bitmap(grid) -> int:
+    """Number of islands via the packed land mask (see `pack_grid`)."""
+    mask, width = pack_grid(grid)
+    return sum(1 for _ in island_areas(mask, width))
+
+
+class BitmapSolution(Solution):
+    def numIslands(self, grid: List[List[str]]) -> int:
+        """Same answer as `Solution.numIslands`, via a bytearray land mask."""
+        return num_islands_bitmap(grid)
+
+
+"""
+Follow-up: Streaming Row-by-Row Island Counting with Union-Find
+---------------------------------------------------------------
+Problem:
+- `numIslands` (and the bitmap engine) need the whole grid in memory. Rasters that arrive as
+  line-oriented files larger than RAM cannot be loaded at all.
+
+Logic and Approach:
+1. Rows as Runs:
+   - Each row is reduced to its maximal runs of land, `[start, end)` column ranges, found in C by
+     `re.finditer(rb'1+', row)`. Work is per run, not per cell.
+   - Two runs in consecutive rows touch (4-connectivity) iff their column ranges overlap.
+2. State Kept Between Rows (O(cols)):
+   - The previous row's runs, the component label of each run (labels compacted to 0..k-1) and each
+     label's area so far. Nothing about earlier rows is kept.
+3. Processing a Row:
+   - A union-find is created over the k active labels; each new run is unioned with every previous run it
+     overlaps (a two-pointer sweep, both run lists are sorted), or starts a new component if it overlaps
+     none. Its length is added to the root's area.
+   - A previous label whose root received no run in this row can never grow again: that island is
+     finished, and its area is emitted.
+   - The roots that did receive runs are relabelled 0..k'-1 for the next row.
+4. End of Input:
+   - Every component still active after the last row is finished too.
+5. API:
+   - `stream_island_areas(rows)` yields each island's area as soon as the island is complete.
+   - `count_islands_streaming(rows, with_areas=False)` returns the count (and optionally the list of areas).
+   - `read_raster(path)` streams a file with one row of '0' / '1' per line (commas, spaces and tabs are
+     ignored). Rows may also be lists of '1' / '0' (the `numIslands` format), str or bytes.
+
+Time and Space Complexity:
+- Time: O(rows * cols) in C for run detection, plus O(R α(R)) Python work for R land runs.
+- Space: O(cols) (runs and labels of one row, a union-find of at most cols nodes), plus the output areas.
+
+Benchmark (`benchmark_streaming`, random rasters, land density 0.4, CPython 3.11):
+- 46000 x 46000 raster file (1.97 GiB on disk, one row per line): 222.9M islands in 789 s, 2.6 MiB/s,
+  2.68M cells/s, peak RSS 22 MiB (13 MiB before streaming). Memory stays flat: the file is never held.
+- 2000^2 in memory: numIslands 7.07 s, streaming 1.35 s (5.2x), since run detection is in C.
+- Density 0.4 noise is close to the worst case (about one run per four cells); the time scales with the
+  number of land runs, so rasters with larger land masses stream considerably faster.
+"""
+import os
+import re
+import tempfile
+
+LAND_RUN = re.compile(rb'1+')
+DIGITS = bytes.maketrans(b'\x00\x01', b'01')  # Rows of 0 / 1 ints (the LC 695 format) as b'0' / b'1'
+
+
+def _row_bytes(row) -> bytes:
+    if isinstance(row, list):
+        row = ''.join(row) if not row or isinstance(row[0], str) else bytes(row).translate(DIGITS)
+    if isinstance(row, str):
+        row = row.encode('ascii')
+    return row.translate(None, b' ,\t\r\n')
+
+
+def stream_island_areas(rows):
+    """
+    Yield the area of every island in a stream of rows, as soon as the island is complete.
+
+    Args:
+        rows (Iterable): Grid rows, top to bottom: lists of '1' / '0', str, or bytes (e.g. file lines).
+    """
+    prev_starts, prev_ends, prev_labels, area = (), (), [], []
+    parent = []
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for row in rows:
+        runs = [match.span() for match in LAND_RUN.finditer(_row_bytes(row))]
+        k, m = len(area), len(prev_starts)
+        parent = list(range(k))
+        size = area  # Indexed by union-find node: labels 0..k-1, then new components
+        run_nodes = []
+        i = 0
+        for start, end in runs:
+            while i < m and prev_ends[i] <= start:
+                i += 1
+            node, j = -1, i
+            while j < m and prev_starts[j] < end:
+                other = prev_labels[j]
+                if parent[other] != other:
+                    other = find(other)
+                if node == -1:
+                    node = other
+                elif other != node:
+                    parent[other] = node
+                    size[node] += size[other]
+                j += 1
+            if node == -1:
+                node = len(parent)
+                parent.append(node)
+                size.append(0)
+            size[node] += end - start
+            run_nodes.append(node)
+
+        roots = [node if parent[node] == node else find(node) for node in run_nodes]
+        continuing = set(roots)
+        for root in {find(label) for label in range(k)} - continuing:
+            yield size[root]
+        relabel, area, prev_labels = {}, [], []
+        for root in roots:
+            if root not in relabel:
+                relabel[root] = len(area)
+                area.append(size[root])
+            prev_labels.append(relabel[root])
+        prev_starts, prev_ends = zip(*runs) if runs else ((), ())
+    yield from area
+
+
+def count_islands_streaming(rows, with_areas: bool = False):
+    """
+    Number of islands in a stream of rows (see `stream_island_areas`), with O(cols) memory.
+
+    Returns:
+        int, or Tuple[int, List[int]] with the area of each island (in completion order) if `with_areas`.
+    """
+    if with_areas:
+        areas = list(stream_island_areas(rows))
+        return len(areas), areas
+    return sum(1 for _ in stream_island_areas(rows))
+
+
+def read_raster(path: str):
+    """Yield the rows of a raster file (one row of '0' / '1' per line) without reading it all."""
+    with open(path, 'rb') as f:
+        yield from f
+
+
+"""
+Follow-up: Tiled Parallel Connected-Component Labeling
+------------------------------------------------------
+Problem:
+- Every engine above scans the grid on one core. Counting islands, the largest island
+  (`maxAreaOfIsland`, LC 695) and the area of every island should come from one pass that can use
+  several processes.
+
+Logic and Approach:
+1. Shared Land Mask:
+   - The grid is packed once into a `multiprocessing.shared_memory` segment, one byte per cell at
+     `r * cols + c` (no padding, so tiles can be cut out by row slices). Pool workers attach to it in
+     their initializer; a task is just a tile's `(r0, r1, c0, c1)` bounds.
+2. Labeling a Tile (`_label_tile`, one process each):
+   - Copy the tile's rows into a private water-padded mask (as `pack_grid` lays it out) and flood every
+     component, writing its label into an `array('i')` of the tile.
+   - Components that touch no tile edge are final: only their areas are returned.
+   - Components on an edge are renumbered 1..b. Their areas are returned, plus the label of every cell
+     on the four edges (0 for water) as four `array('i')` strips.
+3. Merging Borders (in the parent):
+   - A union-find over all edge components of all tiles (global id = tile's base + local id).
+   - Along every vertical seam, cell k of the left tile's right strip touches cell k of the right tile's
+     left strip; along horizontal seams, bottom strips meet top strips. Two non-zero labels facing each
+     other are unioned, and areas are summed at the roots.
+   - Result (`IslandStats`): count = interior components + union-find roots; areas = interior areas +
+     root areas (an array('q'), 8 bytes per island); max_area = the largest of them.
+4. `TiledSolution` answers `numIslands` and `maxAreaOfIsland` (grids of '1' / '0' strings or 1 / 0 ints)
+   with the same engine.
+
+Time and Space Complexity:
+- Time: O(rows * cols / P) for labeling with P workers, plus O(seam cells + edge components) to merge.
+- Space: rows * cols bytes shared, plus 5 bytes per cell of one tile per worker, plus 8 bytes per island
+  for the area array.
+
+Benchmark (`benchmark_tiled`, random grids, land density 0.4, rows streamed into the shared mask,
+CPython 3.11, measured on a single-core machine, so workers time-slice one CPU):
+- 10000^2 (10.5M islands), seconds for 1 / 2 / 4 / 8 workers:
+  - tile  500: 32.5 / 29.5 / 30.0 / 31.6 (3.1-3.4M cells/s)
+  - tile 1000: 31.1 / 37.7 / 34.0 / 31.6
+  - tile 2500: 37.4 / 38.2 / 37.4 / 42.8
+- 40000^2 (168.6M islands, 1.6 GB shared mask), tile 2500: 1 worker 602 s (2.66M cells/s),
+  4 workers 528 s (3.03M cells/s).
+- With one core there is no parallel speed-up to measure: worker counts differ by run-to-run noise
+  (about ±15%), which also shows that the seam merge and result transfer add little on top of labeling.
+  On P cores, labeling (nearly all of the time) is split P ways; the parent's fill of the shared mask
+  and the merge stay serial. That scaling is expected, not measured here.
+- Smaller tiles were slightly faster (500: ~3.2M cells/s vs 2500: ~2.7M cells/s): each tile's private
+  mask and label array fit in cache, and seam work is still negligible at this size.
+"""
+import multiprocessing
+from array import array
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+IslandStats = namedtuple("IslandStats", ["count", "max_area", "areas"])
+_tile_mask = None  # (shared land mask, cols) in a pool worker, set by `_attach_tile_worker`
+
+
+def _label_tile(mask, cols, r0, r1, c0, c1):
+    """
+    Label the components of one tile of an unpadded land mask.
+
+    Returns:
+        Tuple: (interior areas, edge-component areas (index 0 unused), top, bottom, left, right strips of
+        edge-component labels, 0 for water).
+    """
+    width = c1 - c0 + 2
+    tile = bytearray(width)
+    for r in range(r0, r1):
+        tile += b'\x00' + mask[r * cols + c0:r * cols + c1] + b'\x00'
+    tile += bytes(width)
+    labels = array('i', bytes(4 * len(tile)))
+    areas = []
+    i = tile.find(1)
+    while i != -1:
+        label = len(areas) + 1
+        tile[i] = 0
+        labels[i] = label
+        stack, area = [i], 0
+        while stack:
+            j = stack.pop()
+            area += 1
+            for k in (j - 1, j + 1, j - width, j + width):
+                if tile[k]:
+                    tile[k] = 0
+                    labels[k] = label
+                    stack.append(k)
+        areas.append(area)
+        i = tile.find(1, i + 1)
+
+    height = r1 - r0
+    first, last = width + 1, height * width + 1
+    strips = [labels[first:first + width - 2], labels[last:last + width - 2],
+              labels[first:last + 1:width], labels[first + width - 3:last + width - 2:width]]
+    renumber = {}
+    for strip in strips:
+        for label in strip:
+            if label and label not in renumber:
+                renumber[label] = len(renumber) + 1
+    edge_areas = array('q', bytes(8 * (len(renumber) + 1)))
+    for label, local in renumber.items():
+        edge_areas[local] = areas[label - 1]
+    interior = array('q', (area for label, area in enumerate(areas, 1) if label not in renumber))
+    strips = [array('i', (renumber.get(label, 0) for label in strip)) for strip in strips]
+    return (interior, edge_areas, *strips)
+
+
+def _attach_tile_worker(shm, cols):
+    global _tile_mask
+    _tile_mask = (shm, cols)
+
+
+def _label_tile_in_worker(bounds):
+    shm, cols = _tile_mask
+    return _label_tile(shm.buf, cols, *bounds)
+
+
+def tiled_island_stats(grid, tile: int = 1024, processes: int = None, shape: tuple = None) -> IslandStats:
+    """
+    Island count, largest area and every island's area, labeled tile by tile across a process pool.
+
+    Args:
+        grid (Iterable): Rows as lists of '1' / '0' (or 1 / 0), str, or bytes.
+        tile (int): Tile side length in cells.
+        processes (int): Worker processes (default: CPU count); 1 labels every tile in this process.
+        shape (Tuple[int, int]): (rows, cols), required if `grid` is an iterator rather than a sequence.
+    Returns:
+        IslandStats: (count, max_area, areas), areas an array('q') in no particular order.
+    Raises:
+        ValueError: If a row does not have `cols` cells, or the grid does not have exactly `rows` rows
+            (e.g. an iterator that runs out before `shape` says it should).
+    """
+    rows, cols = shape if shape else (len(grid), len(grid[0]) if grid else 0)
+    if not rows or not cols:
+        return IslandStats(0, 0, array('q'))
+    bounds = [(r0, min(r0 + tile, rows), c0, min(c0 + tile, cols))
+              for r0 in range(0, rows, tile) for c0 in range(0, cols, tile)]
+    processes = min(processes or multiprocessing.cpu_count(), len(bounds))
+    shm = None
+    if processes == 1:
+        mask = bytearray(rows * cols)
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=rows * cols)
+        mask = shm.buf
+    try:
+        read = 0
+        for r, row in enumerate(grid):
+            cells = _row_bytes(row)
+            if len(cells) != cols or r >= rows:  # Checked before the slice can resize or misalign the mask
+                raise ValueError(f"Row {r} has {len(cells)} cells; expected {rows} rows of {cols} cells")
+            mask[r * cols:(r + 1) * cols] = cells.translate(LAND)
+            read = r + 1
+        if read != rows:  # Missing rows would silently count as water
+            raise ValueError(f"Grid has {read} rows; expected {rows}")
+        if shm is None:
+            results = [_label_tile(mask, cols, *b) for b in bounds]
+        else:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("fork" if "fork" in methods else None)
+            with context.Pool(processes, _attach_tile_worker, (shm, cols)) as pool:
+                results = pool.map(_label_tile_in_worker, bounds, 1)
+    finally:
+        if shm is not None:
+            del mask
+            shm.close()
+            shm.unlink()
+    return _merge_tiles(results, -(-cols // tile))
+
+
+def _merge_tiles(results, across: int) -> IslandStats:
+    """Union edge components that face each other across tile seams (tiles in row-major order)."""
+    areas, bases, size = array('q'), [], array('q')
+    for t, (interior, edge_areas, *strips) in enumerate(results):
+        areas.extend(interior)
+        results[t] = (None, edge_areas, *strips)  # Free each tile's interior areas once copied
+        bases.append(len(size))
+        size.extend(edge_areas)
+    parent = list(range(len(size)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def join(base_a, strip_a, base_b, strip_b):
+        for a, b in zip(strip_a, strip_b):
+            if a and b:
+                a, b = find(base_a + a), find(base_b + b)
+                if a != b:
+                    parent[b] = a
+                    size[a] += size[b]
+
+    for t, (_, _, _, bottom, _, right) in enumerate(results):
+        if (t + 1) % across:
+            join(bases[t], right, bases[t + 1], results[t + 1][4])
+        if t + across < len(results):
+            join(bases[t], bottom, bases[t + across], results[t + across][2])
+    for t, (_, edge_areas, *_) in enumerate(results):
+        for g in range(bases[t] + 1, bases[t] + len(edge_areas)):
+            if parent[g] == g:
+                areas.append(size[g])
+    return IslandStats(len(areas), max(areas, default=0), areas)
+
+
+class TiledSolution(Solution):
+    def numIslands(self, grid: List[List[str]]) -> int:
+        """Same answer as `Solution.numIslands`, via tiled parallel labeling."""
+        return tiled_island_stats(grid).count
+
+    def maxAreaOfIsland(self, grid: List[List[int]]) -> int:
+        """LC 695: the largest island's area (0 if there is none), from the same tiled pass."""
+        return tiled_island_stats(grid).max_area
+
+
+def random_rows(rows: int, cols: int, density: float = 0.4, seed: int = 0):
+    """Yield `rows` random rows as bytes of b'1' (land, with probability `density`) and b'0'."""
+    rng = random.Random(seed)
+    threshold = bytes(ord('1') if byte < density * 256 else ord('0') for byte in range(256))
+    for _ in range(rows):
+        yield rng.randbytes(cols).translate(threshold)
+
+
+def random_grid(rows: int, cols: int, density: float = 0.4, seed: int = 0) -> List[List[str]]:
+    """A `numIslands`-style grid (lists of '1' / '0') with land probability `density`."""
+    return [list(row.decode('ascii')) for row in random_rows(rows, cols, density, seed)]
+
+
+def test_number_of_islands():
+    """
+    Runs the examples and randomized cross-checks for every implementation in this file.
+    """
+    examples = [
+        ([["1", "1", "0", "0", "0"],
+          ["1", "1", "0", "0", "0"],
+          ["0", "0", "1", "0", "0"],
+          ["0", "0", "0", "1", "1"]], 3),
+        ([["1", "1", "0"], ["0", "1", "0"], ["0", "0", "1"]], 2),
+        ([["1", "0", "1"], ["0", "0", "0"], ["1", "0", "1"]], 4),
+        ([["1"]], 1),
+        ([["0"]], 0),
+        ([], 0),
+    ]
+    for solver in (Solution(), BitmapSolution()):
+        for grid, expected in examples:
+            result = solver.numIslands(grid)
+            assert result == expected, f"{type(solver).__name__}: got {result}, expected {expected}"
+
+    rng = random.Random(200)
+    for seed in range(300):
+        rows, cols = rng.randint(1, 15), rng.randint(1, 15)
+        grid = random_grid(rows, cols, rng.random(), seed)
+        snapshot = [row[:] for row in grid]
+        expected = Solution().numIslands(grid)
+        assert BitmapSolution().numIslands(grid) == expected, "Bitmap count differs"
+        assert grid == snapshot, "The bitmap engine must not modify the grid"
+        mask, width = pack_grid(["".join(row) for row in grid])
+        land = sum(row.count("1") for row in grid)
+        assert sum(island_areas(mask, width)) == land and not any(mask), "Areas must cover all land"
+    try:
+        pack_grid([["1", "1", "1"], ["0", "1"], ["1", "0", "1"]])
+        assert False, "Ragged grid was packed"
+    except ValueError:
+        pass
+    for seed in range(300):
+        rows, cols = rng.randint(1, 20), rng.randint(1, 20)
+        grid = random_grid(rows, cols, rng.random(), seed)
+        mask, width = pack_grid(grid)
+        expected = sorted(island_areas(mask, width))
+        count, areas = count_islands_streaming(grid, with_areas=True)
+        assert count == Solution().numIslands(grid), "Streaming count differs"
+        assert sorted(areas) == expected, "Streaming areas differ"
+        assert count_islands_streaming(iter(grid)) == count
+    spiral = ["11111", "00001", "11101", "10001", "11111"]  # One island that merges late
+    assert count_islands_streaming(spiral, with_areas=True) == (1, [17])
+    assert count_islands_streaming(["101", "111"]) == 1 and count_islands_streaming([]) == 0
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "raster.txt")
+        with open(path, "w") as f:
+            f.write("1,1,0,0,0\n1,1,0,0,0\n0,0,1,0,0\n0,0,0,1,1\n")
+        assert count_islands_streaming(read_raster(path)) == 3, "File rows must stream"
+    for seed in range(150):
+        rows, cols = rng.randint(1, 14), rng.randint(1, 14)
+        grid = random_grid(rows, cols, rng.random(), seed)
+        mask, width = pack_grid(grid)
+        expected = sorted(island_areas(mask, width))
+        for tile in (1, 2, 3, 5, 16):
+            stats = tiled_island_stats(grid, tile, processes=1)
+            assert stats.count == len(expected) and sorted(stats.areas) == expected, f"Tile {tile} differs"
+            assert stats.max_area == max(expected, default=0)
+    grid = random_grid(60, 45, 0.55, seed=25)
+    mask, width = pack_grid(grid)
+    stats = tiled_island_stats(iter(grid), 16, processes=2, shape=(60, 45))
+    assert sorted(stats.areas) == sorted(island_areas(mask, width)), "Parallel tiles differ"
+    area_grid = [[0, 0, 1, 0, 0], [0, 0, 1, 1, 0], [0, 1, 1, 0, 0], [0, 0, 0, 0, 1]]
+    assert TiledSolution().maxAreaOfIsland(area_grid) == 5 and TiledSolution().maxAreaOfIsland([[0, 0]]) == 0
+    assert TiledSolution().numIslands(examples[0][0]) == 3 and tiled_island_stats([]).count == 0
+    ragged = [["1", "1", "1"], ["0", "1"], ["1", "0", "1"]]
+    for processes in (1, 2):
+        try:
+            tiled_island_stats(ragged, 2, processes=processes)
+            assert False, "Ragged grid was labeled"
+        except ValueError:
+            pass
+        try:
+            tiled_island_stats(iter(["11", "00"]), 1, processes=processes, shape=(4, 2))
+            assert False, "Short iterator was labeled"
+        except ValueError:
+            pass
+    print("All number of islands tests passed!")
+
+
+def _timed(fn, *args):
+    """Run fn(*args) and return (result, seconds)."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def _traced_peak(fn, *args):
+    """Peak bytes allocated while fn(*args) runs."""
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def benchmark_bitmap(sides=(1_000, 5_000, 20_000), density=0.4, original_limit=5_000):
+    """
+    Solution.numIslands (tuple set) vs the bytearray engine on random side x side grids. The original
+    runs up to `original_limit` (its visit set does not fit in memory beyond that); the bitmap engine
+    reads the largest grid as a stream of byte rows, since a list-of-lists grid would not fit either.
+    """
+    for side in sides:
+        if side <= original_limit:
+            grid = random_grid(side, side, density)
+            expected, original = _timed(Solution().numIslands, grid)
+            count, bitmap = _timed(num_islands_bitmap, grid)
+            assert count == expected
+            line = f"{side:>6}^2: numIslands {original:7.2f} s | bitmap {bitmap:6.2f} s ({original / bitmap:4.1f}x)"
+            if side <= 1_000:
+                set_peak = _traced_peak(Solution().numIslands, grid)
+                mask_peak = _traced_peak(num_islands_bitmap, grid)
+                line += f" | peak {set_peak / side ** 2:5.1f} vs {mask_peak / side ** 2:4.2f} B/cell"
+            print(line)
+            del grid
+        else:
+            count, bitmap = _timed(num_islands_bitmap, random_rows(side, side, density))
+            print(f"{side:>6}^2: numIslands {'n/a':>7}   | bitmap {bitmap:6.2f} s ({count:,} islands)")
+
+
+def _peak_rss():
+    """Peak resident set size of this process in bytes (Linux; None elsewhere)."""
+    if not os.path.exists("/proc/self/status"):
+        return None
+    with open("/proc/self/status") as status:
+        return next(int(line.split()[1]) * 1024 for line in status if line.startswith("VmHWM"))
+
+
+def benchmark_streaming(side=46_000, sample=2_000, density=0.4):
+    """
+    The streaming counter on a side x side raster file written to disk (~2 GB at the default size), with
+    its throughput and peak RSS; then streaming vs numIslands on an in-memory sample grid.
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "raster.txt")
+        with open(path, "wb") as f:
+            for row in random_rows(side, side, density, seed=1):
+                f.write(row + b"\n")
+        size = os.path.getsize(path)
+        baseline = _peak_rss()
+        count, elapsed = _timed(count_islands_streaming, read_raster(path))
+        peak = _peak_rss()
+        print(f"{side}^2 raster file, {size / 2**30:.2f} GiB: {count:,} islands in {elapsed:.0f} s, "
+              f"{size / elapsed / 2**20:.1f} MiB/s, {side * side / elapsed / 1e6:.2f}M cells/s")
+        if peak is not None:
+            print(f"peak RSS {peak / 2**20:.0f} MiB (before streaming: {baseline / 2**20:.0f} MiB)")
+    grid = random_grid(sample, sample, density)
+    expected, original = _timed(Solution().numIslands, grid)
+    count, streaming = _timed(count_islands_streaming, grid)
+    assert count == expected
+    print(f"{sample}^2 in memory: numIslands {original:.2f} s, streaming {streaming:.2f} s")
+
+
+def benchmark_tiled(sides=(10_000, 40_000), tiles=(500, 1_000, 2_500), workers=(1, 2, 4, 8), density=0.4,
+                    largest_runs=((2_500, 1), (2_500, 4))):
+    """
+    Throughput of tiled_island_stats for every tile size x worker count on the smaller grids; the largest
+    grid only runs the `largest_runs` (tile, workers) pairs. Rows are streamed in, so the grid exists only
+    as the shared mask.
+    """
+    for side in sides:
+        runs = [(tile, processes) for tile in tiles for processes in workers]
+        if side == max(sides) and len(sides) > 1:
+            runs = list(largest_runs)
+        reference = None
+        for tile, processes in runs:
+            stats, elapsed = _timed(tiled_island_stats, random_rows(side, side, density), tile, processes,
+                                    (side, side))
+            reference = reference or (stats.count, stats.max_area)
+            assert (stats.count, stats.max_area) == reference
+            print(f"{side:>6}^2 tile {tile:>5} workers {processes:>2}: {elapsed:7.1f} s, "
+                  f"{side * side / elapsed / 1e6:5.2f}M cells/s ({stats.count:,} islands, max area {stats.max_area})")
+
+
+if __name__ == "__main__":
+    test_number_of_islands()
@@ -45,6 +45,7 @@ The design leverages two data structures for efficiency:
 1. Node Class:
    - Represents a key-value pair with `prev` and `next` pointers, forming the doubly linked list.
    - Each node stores `key` and `val` to allow removal from the hash map when evicted.
+   - Uses `__slots__`, so a node has no per-instance `__dict__`.
 
 2. LRUCache Initialization:
    - Set `capacity` to limit the cache size.
@@ -74,10 +75,24 @@ The design leverages two data structures for efficiency:
 6. Put Method:
    - Goal: Insert or update a key-value pair, evict LRU if over capacity.
    - Logic:
-     - If `key` exists, remove its old node to avoid duplicates.
-     - Create a new node with the key-value pair, add to `cache`, and insert at MRU.
-     - If `len(cache) > capacity`, identify the LRU (node after `left`), remove it from the list, and delete its key from `cache`.
-   - This maintains the cache within its size limit, evicting the least used item.
+     - If `key` exists, overwrite `node.val` in place and move the node to MRU. Nothing is allocated.
+     - Otherwise, if there is room, create a new node.
+     - If the cache is full, take the LRU (node after `left`), unlink it, delete its old key from `cache`,
+       and recycle the same node for the new key.
+     - Add the node to `cache` and insert it at MRU.
+   - This maintains the cache within its size limit, and once full, `put` never allocates a node.
+
+7. Batch Methods (`get_many` / `put_many`):
+   - Same results as calling `get` / `put` in a loop, but in one pass with locals instead of helper calls.
+   - One dict probe per key; nodes that are already MRU are not relinked.
+   - `put_many` lets the list grow past capacity during the batch and then evicts the overflow in one
+     walk from `left`, with a single relink at the end instead of one eviction per insert.
+   - Nodes evicted that way go to `spare` and are recycled for the next batch's new keys, so batches
+     stay allocation-free like `put`. Spared nodes are cleared so they do not keep evicted keys and
+     values alive, and `spare` is capped at `capacity` nodes; any overflow beyond that is dropped.
+   - `benchmark_batches` (capacity 100K, 1M puts + 1M gets, ~50% misses): batched vs looped is
+     1.23x at batch size 10, 1.33x at 100 and 1.38x at 1000. Without `spare`, allocating fresh
+     nodes made `put_many` ~30% slower than the loop, so the recycling is what makes batching pay.
 
 Time and Space Complexity
 -------------------------
@@ -95,6 +110,8 @@ Solution -
 """
 
 class Node:
+    __slots__ = ('key', 'val', 'prev', 'next')
+
     def __init__(self, key, value):
         """Initialize a doubly linked list node with key and value."""
         self.key = key
@@ -112,6 +129,7 @@ class LRUCache:
         """
         self.cap = capacity
         self.cache = {}  # Hash map: key -> Node
+        self.spare = []  # Nodes evicted by put_many, reused by the next batch
         
         # Dummy nodes: left (LRU side), right (MRU side)
         self.left, self.right = Node(0, 0), Node(0, 0)
@@ -153,15 +171,93 @@ class LRUCache:
             key (int): Key to insert or update.
             value (int): Value associated with the key.
         """
-        if key in self.cache:
-            self.remove(self.cache[key])
-        self.cache[key] = Node(key, value)
-        self.insert(self.cache[key])
+        node = self.cache.get(key)
+        if node is not None:
+            # Update in place and promote to MRU, no new Node
+            node.val = value
+            self.remove(node)
+            self.insert(node)
+            return
+
+        if len(self.cache) < self.cap:
+            node = Node(key, value)
+        elif self.cache:
+            node = self.left.next  # LRU is just after left, recycle it
+            self.remove(node)
+            del self.cache[node.key]
+            node.key, node.val = key, value
+        else:
+            return  # Capacity 0 holds nothing
+
+        self.cache[key] = node
+        self.insert(node)
+
+    def get_many(self, keys) -> list:
+        """
+        Batch `get`: look up every key, promote the hits to MRU in order, return the values.
+
+        Args:
+            keys (Iterable[int]): Keys to look up.
+        Returns:
+            List[int]: Value for each key (-1 where missing), in the same order.
+        """
+        cache, right = self.cache, self.right
+        values = []
+        append = values.append
+        for key in keys:
+            node = cache.get(key)  # Single probe per key
+            if node is None:
+                append(-1)
+                continue
+            if node is not right.prev:  # Already MRU: no relinking needed
+                prev, nxt = node.prev, node.next
+                prev.next, nxt.prev = nxt, prev
+                last = right.prev
+                last.next, right.prev = node, node
+                node.prev, node.next = last, right
+            append(node.val)
+        return values
+
+    def put_many(self, items) -> None:
+        """
+        Batch `put`: insert or update every pair, then evict the overflow from the LRU end once.
+
+        Args:
+            items (Iterable[Tuple[int, int]]): Key-value pairs, applied in order.
+        """
+        cache, right, spare = self.cache, self.right, self.spare
+        for key, value in items:
+            node = cache.get(key)
+            if node is None:
+                if spare:  # Recycle a node evicted by an earlier batch
+                    node = spare.pop()
+                    node.key, node.val = key, value
+                else:
+                    node = Node(key, value)
+                cache[key] = node
+            else:
+                node.val = value
+                if node is right.prev:
+                    continue
+                prev, nxt = node.prev, node.next
+                prev.next, nxt.prev = nxt, prev
+            last = right.prev
+            last.next, right.prev = node, node
+            node.prev, node.next = last, right
 
-        if len(self.cache) > self.cap:
-            lru = self.left.next  # LRU is just after left
-            self.remove(lru)
-            del self.cache[lru.key]
+        # Bulk eviction: drop the `excess` LRU keys, then cut the list once
+        excess = len(cache) - self.cap
+        if excess > 0:
+            node, room = self.left.next, self.cap - len(spare)
+            for _ in range(excess):
+                del cache[node.key]
+                nxt = node.next
+                if room > 0:  # Keep at most `cap` spares, holding no stale key/value
+                    node.key = node.val = node.prev = node.next = None
+                    spare.append(node)
+                    room -= 1
+                node = nxt
+            self.left.next, node.prev = node, self.left
 
 
 """
@@ -179,10 +275,10 @@ capacity = 2:
    - Insert Node(1,1): left <-> Node(2,2) <-> Node(1,1) <-> right
    - Return: 1
 4. put(3, 3):
-   - Over capacity, LRU = Node(2,2)
+   - Cache is full, LRU = Node(2,2)
    - Remove Node(2,2): left <-> Node(1,1) <-> right
    - Delete {2}: Cache = {1: Node(1,1)}
-   - Insert Node(3,3): left <-> Node(1,1) <-> Node(3,3) <-> right
+   - Recycle the node as Node(3,3) and insert: left <-> Node(1,1) <-> Node(3,3) <-> right
    - Cache: {1: Node(1,1), 3: Node(3,3)}
 
 Notes on Overall Approach
@@ -208,7 +304,2637 @@ Notes on Overall Approach
 
 - Greedy Eviction:
   - Evicting LRU on overflow is optimal for the LRU policy, ensuring the most recently used items are retained.
+
+- Allocation-Free Put:
+  - Overwrites reuse the existing node and evictions recycle the LRU node, so a full cache never
+    allocates in `put`; `__slots__` also drops the per-node `__dict__`.
+  - `benchmark_put` (1M puts, capacity 100K, CPython 3.11), before -> after:
+    - 90% overwrite: 0.47 -> 1.00 M puts/s
+    - 100% insert:   0.87 -> 1.45 M puts/s
+"""
+
+
+"""
+Follow-up: Array-Backed LRU Cache
+---------------------------------
+Goal: Same `get`/`put` API, but sized for tens of millions of entries.
+
+Why?
+- Every `Node` above is a full Python object (header, `key`, `val`, `prev`, `next`), so each cached key
+  carries well over 150 bytes of overhead on top of its dict entry.
+- The key and value still have to live somewhere, but the links do not need to be objects at all.
+
+Logic of Solution:
+1. Slots instead of Nodes:
+   - Every entry lives in a numbered slot. `keys[slot]` and `vals[slot]` hold the pair, and
+     `prev[slot]` / `next[slot]` hold the neighbouring slot indices.
+   - `prev` and `next` are preallocated `array('q')` buffers (8 bytes per link on every platform, no
+     object per entry).
+   - The hash map stores `key -> slot` instead of `key -> Node`.
+2. Sentinels:
+   - Slot 0 (`LEFT`) and slot 1 (`RIGHT`) play the role of the dummy `left` / `right` nodes.
+3. Free-List:
+   - Unused slots are chained through `next`, starting at `self.free` (-1 means empty).
+   - `put` pops a slot from the free-list while the cache is filling up. Once full, the LRU slot is
+     unlinked and reused in place for the incoming key.
+   - All buffers are sized once in `__init__`, so the hot path never allocates.
+
+Time and Space Complexity:
+- Time Complexity: O(1) for `get` and `put` (same hash map + link updates, on integers instead of objects).
+- Space Complexity: O(capacity), allocated up front.
+
+Example: capacity = 2 (slots 2 and 3 are usable, free = 2 -> 3 -> -1)
+- put(1, 1): slot 2 from free-list, LEFT <-> 2 <-> RIGHT
+- put(2, 2): slot 3 from free-list, LEFT <-> 2 <-> 3 <-> RIGHT
+- get(1): move slot 2 to MRU, LEFT <-> 3 <-> 2 <-> RIGHT, return 1
+- put(3, 3): full, LRU is slot 3 (key 2), reuse it for key 3, LEFT <-> 2 <-> 3 <-> RIGHT
+"""
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+
+class ArrayLRUCache:
+    LEFT, RIGHT = 0, 1  # Sentinel slots
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the array-backed LRU Cache, allocating all slots up front.
+
+        Args:
+            capacity (int): Maximum number of key-value pairs the cache can hold.
+        """
+        self.cap = capacity
+        self.cache = {}  # Hash map: key -> slot
+        size = capacity + 2
+
+        self.keys = [None] * size
+        self.vals = [None] * size
+        self.prev = array('q', [0]) * size
+        # next[i] = i + 1 chains every slot into the free-list in one shot
+        self.next = array('q', range(1, size + 1))
+        self.next[size - 1] = -1
+
+        # Empty list: LEFT <-> RIGHT (next[LEFT] is already RIGHT)
+        self.prev[self.RIGHT] = self.LEFT
+        self.free = 2 if capacity > 0 else -1  # Head of the free-list
+
+    def remove(self, slot):
+        """Unlink a slot from the recency list."""
+        prev, nxt = self.prev[slot], self.next[slot]
+        self.next[prev] = nxt
+        self.prev[nxt] = prev
+
+    def insert(self, slot):
+        """Link a slot at the MRU position (just before RIGHT)."""
+        prev = self.prev[self.RIGHT]
+        self.next[prev] = slot
+        self.prev[self.RIGHT] = slot
+        self.prev[slot], self.next[slot] = prev, self.RIGHT
+
+    def get(self, key: int) -> int:
+        """
+        Get the value of the key if it exists, move it to MRU, else return -1.
+
+        Args:
+            key (int): Key to look up.
+        Returns:
+            int: Value if key exists, -1 otherwise.
+        """
+        slot = self.cache.get(key)
+        if slot is None:
+            return -1
+        self.remove(slot)
+        self.insert(slot)
+        return self.vals[slot]
+
+    def put(self, key: int, value: int) -> None:
+        """
+        Insert or update a key-value pair, reusing the LRU slot if at capacity.
+
+        Args:
+            key (int): Key to insert or update.
+            value (int): Value associated with the key.
+        """
+        slot = self.cache.get(key)
+        if slot is not None:
+            self.vals[slot] = value
+            self.remove(slot)
+            self.insert(slot)
+            return
+
+        if self.free != -1:
+            slot = self.free  # Pop from the free-list
+            self.free = self.next[slot]
+        else:
+            if self.cap <= 0:
+                return
+            slot = self.next[self.LEFT]  # LRU is just after LEFT, reuse its slot
+            self.remove(slot)
+            del self.cache[self.keys[slot]]
+
+        self.keys[slot] = key
+        self.vals[slot] = value
+        self.cache[key] = slot
+        self.insert(slot)
+
+
+"""
+Notes on the Array-Backed Version
+---------------------------------
+- Per entry we pay one dict entry, two 8-byte links, two list pointers and the slot number (an int
+  object held by the dict), instead of a dict entry plus a whole `Node` object.
+- Eviction never frees anything: the LRU slot is overwritten in place, so steady-state `put` does
+  not touch the allocator except for the dict itself.
+- Trade-off: the full capacity is paid for at construction time, even if the cache never fills up.
+
+- The hash map is now the dominant cost (~40-80 bytes per key depending on where the dict is in its
+  resize cycle), so the saving is the `Node` object, not the whole 150 bytes.
+- No per-entry object is tracked by the garbage collector: the slot ints are untracked and the buffers
+  are a handful of containers. A `Node` cache adds one tracked object per entry, so every full
+  collection walks all of them, and filling it triggers collections that walk them again and again.
+
+Benchmark (`benchmark_storage`, CPython 3.11, int keys/values; memory traced after filling to capacity,
+fill timed with the collector enabled, then one full `gc.collect()` timed, throughput over the n puts +
+n random gets + n evicting puts; 2 runs):
+- 1M entries: LRUCache 105.9 B/entry, fill 0.71-0.76 s, full gc 74-75 ms, 1.53-1.63 M ops/s
+              ArrayLRUCache 106.1 B/entry, fill 0.35 s, full gc 25 ms, 1.27-1.29 M ops/s
+- 5M entries: LRUCache 97.6 B/entry, fill 4.66-4.77 s, full gc 455-466 ms, 1.26-1.28 M ops/s
+              ArrayLRUCache 98.0 B/entry, fill 1.78-1.80 s, full gc 146-160 ms, 1.18-1.19 M ops/s
+- Memory is now a wash: once `Node` gained `__slots__` (see Allocation-Free Put above) it costs about
+  the same as two list pointers, two links and a slot int.
+- The measurable gain is garbage-collector work: filling is 2-2.6x faster and every full collection
+  pauses ~3x less. That grows with capacity, so this engine is for very large caches in processes
+  that keep the collector on. Steady-state get/put is 5-20% slower (array indexing boxes every link).
+- Measured at 1M and 5M entries on a 5 GB, single-core machine; the earlier 10M run was not repeated.
+"""
+
+
+"""
+Follow-up: Sharded, Thread-Safe LRU Cache
+-----------------------------------------
+Goal: Share one cache between worker threads without a single global lock.
+
+Why?
+- `get` is not read-only: it relinks the node via `remove` / `insert`, so the plain `LRUCache` has to be
+  wrapped in one mutex, and every thread queues on it.
+
+Logic of Solution:
+1. Shards:
+   - Keep `shards` independent `LRUCache` segments, each guarded by its own `threading.Lock`.
+   - A key always maps to the same segment: `hash(key) % shards`.
+2. Capacity Policy:
+   - By default the total `capacity` is split evenly (rounded up), so the whole cache holds about `capacity` keys.
+   - Passing `shard_capacity` gives every segment that exact capacity instead.
+   - Either way LRU order is per shard: the evicted key is the LRU of its own segment, not of the whole
+     cache. With a reasonable hash this is a close approximation of global LRU.
+3. Get / Put:
+   - Pick the segment, take its lock, delegate to the segment's `get` / `put`.
+
+Time and Space Complexity:
+- Time Complexity: O(1) for `get` and `put`, plus one lock acquire/release.
+- Space Complexity: O(capacity) plus O(shards) for the segments and locks.
+
+Benchmark (`benchmark_threads`, 400K zipfian ops over 1M keys, capacity 100K, CPython 3.11 on 1 core):
+- Threads:          1     2     4     8     16    32   (M ops/s)
+- LockedLRUCache:   0.60  0.57  0.52  0.45  0.47  0.47
+- ShardedLRUCache:  0.58  0.60  0.59  0.54  0.49  0.51
+- The single lock loses ~25% to contention as threads are added, the sharded cache holds flat.
+  Real scaling beyond that needs more cores and a build without the GIL; the Python code itself
+  is still serialized by the interpreter.
+"""
+import threading
+
+
+class ShardedLRUCache:
+    def __init__(self, capacity: int, shards: int = 16, shard_capacity: int = None):
+        """
+        Initialize `shards` independent LRU segments, each with its own lock.
+
+        Args:
+            capacity (int): Total number of key-value pairs, split evenly across segments.
+            shards (int): Number of segments.
+            shard_capacity (int): If given, every segment gets this capacity and `capacity` is ignored.
+        """
+        if shard_capacity is None:
+            shard_capacity = -(-capacity // shards)  # Ceiling division
+        self.n = shards
+        self.shards = [LRUCache(shard_capacity) for _ in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+
+    def get(self, key: int) -> int:
+        """Return the value of `key` from its segment, or -1."""
+        i = hash(key) % self.n
+        with self.locks[i]:
+            return self.shards[i].get(key)
+
+    def put(self, key: int, value: int) -> None:
+        """Insert or update `key` in its segment, evicting that segment's LRU if full."""
+        i = hash(key) % self.n
+        with self.locks[i]:
+            self.shards[i].put(key, value)
+
+
+class LockedLRUCache:
+    def __init__(self, capacity: int):
+        """Baseline: one `LRUCache` behind a single global lock."""
+        self.lru = LRUCache(capacity)
+        self.lock = threading.Lock()
+
+    def get(self, key: int) -> int:
+        with self.lock:
+            return self.lru.get(key)
+
+    def put(self, key: int, value: int) -> None:
+        with self.lock:
+            self.lru.put(key, value)
+
+
+def zipf_keys(n_keys, count, s=1.0, rng=None):
+    """
+    Draw `count` keys in [0, n_keys) with a zipfian distribution (key i has weight 1 / (i + 1) ** s).
+    """
+    rng = rng or random.Random(0)
+    weights = [1 / (i + 1) ** s for i in range(n_keys)]
+    return rng.choices(range(n_keys), weights=weights, k=count)
+
+
 """
+Follow-up: Scan-Resistant Eviction Policies (2Q, ARC, W-TinyLFU)
+----------------------------------------------------------------
+Goal: Keep the `get`/`put` API, but stop a single sequential scan from flushing the hot set.
+
+Why?
+- Plain LRU puts every new key at MRU. A scan over N >= capacity cold keys pushes every hot key
+  through `left` and out of the cache, and the hit rate has to rebuild from zero afterwards.
+
+All three policies below keep O(1) `get`/`put`. They use `OrderedDict` as the "hash map + doubly linked
+list" pair: `move_to_end` is the `remove` + `insert` to MRU, and `popitem(last=False)` pops the LRU.
+
+1. 2Q (TwoQueueCache):
+   - `a1in`: FIFO of keys seen once. Once the cache is full, `a1in` is evicted first whenever it holds more
+     than ~25% of capacity, so a scan of one-off keys only churns this queue.
+   - `a1out`: ghost keys (no values) recently evicted from `a1in` (~50% of capacity).
+   - `am`: LRU of keys seen again, either hit while in `a1in` or re-inserted while their ghost is in `a1out`.
+
+2. ARC (ARCCache):
+   - `t1` (seen once) and `t2` (seen at least twice) hold values; `b1` / `b2` are their ghost lists.
+   - The target size `p` of `t1` adapts: a ghost hit in `b1` grows `p` (recency is paying off),
+     a ghost hit in `b2` shrinks it (frequency is paying off).
+   - `_replace` evicts from `t1` or `t2` depending on `p`.
+
+3. W-TinyLFU (TinyLFUCache):
+   - A small LRU window (1% of capacity) admits every new key.
+   - The main area is a segmented LRU: `probation` (new arrivals) and `protected` (80% of main, keys hit
+     while in probation).
+   - Keys leaving the window must beat the probation LRU victim on estimated frequency to get in.
+   - Frequencies come from a 4-row count-min sketch of 4-bit counters (`CountMinSketch`); every counter
+     is halved after 10 * capacity increments, so old popularity fades.
+
+Time and Space Complexity:
+- Time Complexity: O(1) for `get` and `put` in all three (the sketch's periodic halving is O(width),
+  amortized O(1) over the 10 * capacity increments between resets).
+- Space Complexity: O(capacity) for values, plus O(capacity) ghost keys (2Q, ARC) or the sketch (W-TinyLFU).
+"""
+from collections import OrderedDict
+
+
+class TwoQueueCache:
+    def __init__(self, capacity: int, kin: float = 0.25, kout: float = 0.5):
+        """
+        Initialize a 2Q cache.
+
+        Args:
+            capacity (int): Maximum number of key-value pairs the cache can hold.
+            kin (float): Fraction of capacity the `a1in` FIFO may occupy before it is evicted first.
+            kout (float): Number of ghost keys kept in `a1out`, as a fraction of capacity.
+        """
+        self.cap = capacity
+        self.kin = max(1, int(capacity * kin))
+        self.kout = max(1, int(capacity * kout))
+        self.a1in = OrderedDict()   # key -> value, FIFO
+        self.a1out = OrderedDict()  # key -> None, ghost FIFO
+        self.am = OrderedDict()     # key -> value, LRU
+
+    def _reclaim(self):
+        """Free one slot if the cache is full."""
+        if len(self.a1in) + len(self.am) < self.cap:
+            return
+        if len(self.a1in) > self.kin or not self.am:
+            key, _ = self.a1in.popitem(last=False)
+            self.a1out[key] = None  # Remember it as a ghost
+            if len(self.a1out) > self.kout:
+                self.a1out.popitem(last=False)
+        else:
+            self.am.popitem(last=False)
+
+    def get(self, key: int) -> int:
+        """Return the value of `key`, or -1. A second hit promotes a key from `a1in` to `am`."""
+        if key in self.am:
+            self.am.move_to_end(key)
+            return self.am[key]
+        if key in self.a1in:
+            value = self.am[key] = self.a1in.pop(key)
+            return value
+        return -1
+
+    def put(self, key: int, value: int) -> None:
+        """Insert or update `key`; re-referenced ghosts go straight to `am`."""
+        if self.cap <= 0:
+            return
+        if key in self.am:
+            self.am[key] = value
+            self.am.move_to_end(key)
+        elif key in self.a1in:
+            del self.a1in[key]
+            self.am[key] = value
+        elif key in self.a1out:
+            del self.a1out[key]
+            self._reclaim()
+            self.am[key] = value
+        else:
+            self._reclaim()
+            self.a1in[key] = value
+
+
+class ARCCache:
+    def __init__(self, capacity: int):
+        """
+        Initialize an Adaptive Replacement Cache.
+
+        Args:
+            capacity (int): Maximum number of key-value pairs the cache can hold.
+        """
+        self.cap = capacity
+        self.p = 0  # Target size of t1
+        self.t1, self.t2 = OrderedDict(), OrderedDict()  # key -> value
+        self.b1, self.b2 = OrderedDict(), OrderedDict()  # key -> None (ghosts)
+
+    def _replace(self, in_b2):
+        """Evict the LRU of t1 or t2 into its ghost list, steered by the target `p`."""
+        if len(self.t1) + len(self.t2) < self.cap:
+            return
+        if self.t1 and (len(self.t1) > self.p or (in_b2 and len(self.t1) == self.p) or not self.t2):
+            key, _ = self.t1.popitem(last=False)
+            self.b1[key] = None
+        else:
+            key, _ = self.t2.popitem(last=False)
+            self.b2[key] = None
+
+    def get(self, key: int) -> int:
+        """Return the value of `key` and promote it to t2's MRU, or -1."""
+        if key in self.t1:
+            value = self.t2[key] = self.t1.pop(key)
+            return value
+        if key in self.t2:
+            self.t2.move_to_end(key)
+            return self.t2[key]
+        return -1
+
+    def put(self, key: int, value: int) -> None:
+        """Insert or update `key`, adapting `p` on ghost hits."""
+        if self.cap <= 0:
+            return
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = value
+        elif key in self.t2:
+            self.t2[key] = value
+            self.t2.move_to_end(key)
+        elif key in self.b1:
+            self.p = min(self.cap, self.p + max(len(self.b2) // len(self.b1), 1))
+            del self.b1[key]
+            self._replace(False)
+            self.t2[key] = value
+        elif key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            del self.b2[key]
+            self._replace(True)
+            self.t2[key] = value
+        else:
+            l1 = len(self.t1) + len(self.b1)
+            if l1 >= self.cap:
+                if len(self.t1) < self.cap:
+                    self.b1.popitem(last=False)
+                    self._replace(False)
+                else:
+                    self.t1.popitem(last=False)
+            elif l1 + len(self.t2) + len(self.b2) >= self.cap:
+                if l1 + len(self.t2) + len(self.b2) >= 2 * self.cap:
+                    self.b2.popitem(last=False)
+                self._replace(False)
+            self.t1[key] = value
+
+
+class CountMinSketch:
+    HALVE = bytes(i >> 1 for i in range(256))  # Translation table for aging
+
+    def __init__(self, capacity: int, depth: int = 4):
+        """
+        Initialize a count-min sketch of 4-bit counters sized for `capacity` keys.
+
+        Args:
+            capacity (int): Expected number of distinct hot keys.
+            depth (int): Number of hash rows (at most 8).
+        """
+        width = 1
+        while width < max(capacity, 16):
+            width <<= 1
+        self.mask = width - 1
+        self.table = bytearray(width * depth)
+        seeds = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F, 0x165667B1, 0xD3A2646C, 0xFD7046C5, 0xB55A4F09)
+        self.rows = [(row * width, seeds[row]) for row in range(depth)]  # (table offset, odd multiplier)
+        self.additions = 0
+        self.sample = 10 * max(capacity, 1)  # Halve every counter after this many increments
+
+    def _slots(self, key):
+        """One counter index per row, from a multiplicative hash of the 32-bit folded key hash."""
+        h = hash(key)
+        h = (h ^ (h >> 32)) & 0xFFFFFFFF
+        mask = self.mask
+        return [offset + ((h * seed >> 16) & mask) for offset, seed in self.rows]
+
+    def increment(self, key):
+        """Count one access to `key` (counters saturate at 15)."""
+        table = self.table
+        for i in self._slots(key):
+            if table[i] < 15:
+                table[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample:
+            self.table = bytearray(self.table.translate(self.HALVE))
+            self.additions //= 2
+
+    def estimate(self, key):
+        """Estimated access count of `key` (never an underestimate, before aging)."""
+        table = self.table
+        return min(table[i] for i in self._slots(key))
+
+
+class TinyLFUCache:
+    def __init__(self, capacity: int, window: float = 0.01, protected: float = 0.8):
+        """
+        Initialize a W-TinyLFU cache.
+
+        Args:
+            capacity (int): Maximum number of key-value pairs the cache can hold.
+            window (float): Fraction of capacity given to the admission window LRU.
+            protected (float): Fraction of the main area given to the protected segment.
+        """
+        self.cap = capacity
+        self.window_cap = max(1, int(capacity * window)) if capacity > 0 else 0
+        self.main_cap = capacity - self.window_cap
+        self.protected_cap = int(self.main_cap * protected)
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = CountMinSketch(capacity)
+
+    def _promote(self, key):
+        """Move a probation hit into protected, demoting protected's LRU if it overflows."""
+        self.protected[key] = self.probation.pop(key)
+        if len(self.protected) > self.protected_cap:
+            old, value = self.protected.popitem(last=False)
+            self.probation[old] = value
+
+    def get(self, key: int) -> int:
+        """Return the value of `key`, or -1. Every lookup feeds the frequency sketch."""
+        self.sketch.increment(key)
+        if key in self.window:
+            self.window.move_to_end(key)
+            return self.window[key]
+        if key in self.protected:
+            self.protected.move_to_end(key)
+            return self.protected[key]
+        if key in self.probation:
+            value = self.probation[key]
+            self._promote(key)
+            return value
+        return -1
+
+    def put(self, key: int, value: int) -> None:
+        """Insert or update `key`. New keys enter the window; window evictees compete for main."""
+        if self.cap <= 0:
+            return
+        for segment in (self.window, self.protected):
+            if key in segment:
+                segment[key] = value
+                segment.move_to_end(key)
+                return
+        if key in self.probation:
+            self.probation[key] = value
+            self._promote(key)
+            return
+
+        self.window[key] = value
+        if len(self.window) <= self.window_cap:
+            return
+        candidate, cvalue = self.window.popitem(last=False)
+        if len(self.probation) + len(self.protected) < self.main_cap:
+            self.probation[candidate] = cvalue
+            return
+        if not self.probation:
+            return  # Main is all protected (or empty): nothing to compete with
+        victim = next(iter(self.probation))
+        if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+            del self.probation[victim]
+            self.probation[candidate] = cvalue
+
+
+"""
+Notes on the Eviction Policies
+------------------------------
+- 2Q here promotes a key from `a1in` to `am` on its second hit (as most production 2Q variants do);
+  the original paper only promotes through the `a1out` ghost list, which never protects a hot set
+  that fits in the cache before the first scan arrives.
+- ARC has no tuning knobs: `p` finds the recency/frequency balance by itself.
+- W-TinyLFU pays for a sketch update on every `get`. In pure Python that is several times the cost
+  of the `OrderedDict` work, so it trades throughput for admission quality.
+
+Benchmark (`benchmark_policies`, capacity 10K, 500K zipfian gets over 100K keys, put on miss;
+"zipf+scan" adds a 20K-key sequential scan every 50K accesses; CPython 3.11):
+- zipf:      LRU 73.2% @ 2.0 M ops/s | 2Q 76.2% @ 2.0 | ARC 76.8% @ 1.7 | W-TinyLFU 76.5% @ 0.30
+- zipf+scan: LRU 50.7% @ 2.0 M ops/s | 2Q 56.0% @ 1.4 | ARC 56.5% @ 1.2 | W-TinyLFU 55.1% @ 0.23
+"""
+
+# Name -> class, so callers (and the benchmarks) can pick a policy by name
+EVICTION_POLICIES = {
+    "lru": LRUCache,
+    "2q": TwoQueueCache,
+    "arc": ARCCache,
+    "tinylfu": TinyLFUCache,
+}
+
+
+"""
+Follow-up: Per-Entry TTL with Timer-Wheel Expiry
+------------------------------------------------
+Goal: `put(key, value, ttl)` makes an entry expire `ttl` seconds later; expired entries are never returned
+and give up their capacity before any live entry is evicted.
+
+Logic of Solution:
+1. Lazy Expiry:
+   - Every node carries an absolute `expires` time (`None` = never). `get` on an expired node unlinks it
+     and returns -1, exactly like a miss.
+2. Proactive Expiry with a Hierarchical Timer Wheel (TimerWheel):
+   - Time is cut into ticks (`tick` seconds). Level 0 has 64 slots of 1 tick, level 1 has 64 slots of
+     64 ticks, level 2 of 64^2 ticks, and so on.
+   - A node due at tick T, with D = T - current ticks to go, goes into the lowest level whose span covers D,
+     in slot `(T >> 6 * level) & 63`. Each slot is a dict `key -> node`, and the node remembers its
+     slot (`bucket`), so scheduling and cancelling are both O(1).
+   - Each tick fires level 0's slot; every 64 ticks the next level's slot fires too and its nodes
+     cascade down into finer slots. A node moves down at most `levels` times before it expires, so
+     expiry is O(1) amortized per entry. There is never a scan of the whole cache.
+3. Bounded Housekeeping:
+   - A fired slot is swapped for an empty dict and queued in `pending`; draining it happens a few nodes
+     at a time. Each `get` / `put` spends at most `budget` units of work (one per tick advanced or
+     node drained), so a burst of expirations is spread over many calls instead of stalling one.
+   - `expire()` drains everything that is due and can be called from a background thread/timer.
+4. Expired Before Live:
+   - When `put` needs room, it first keeps draining the wheel until one expired entry is freed or
+     nothing due remains. Only then is the live LRU entry evicted.
+
+Time and Space Complexity:
+- Time Complexity: O(1) amortized for `get` / `put` (bounded by `budget` per call), O(1) per expiring entry.
+- Space Complexity: O(capacity) plus 64 * levels slot dicts.
+
+Benchmark (`benchmark_ttl`, 1M keys, 1M get/put-on-miss ops, simulated clock at 1 ms per op,
+TTLs of 1 s / 10 s / 1 min / 10 min / none; per-op latency, CPython 3.11):
+- LRUCache (no TTL):     p50 1.1 us, p99  2.8 us, p99.9   40 us, p99.99  634 us
+- TTL, budget 2:         p50 4.5 us, p99 14.5 us, p99.9   69 us, p99.99  948 us
+- TTL, budget 8:         p50 4.0 us, p99 34.8 us, p99.9  110 us, p99.99 1062 us
+- TTL, unbounded budget: p50 4.3 us, p99  6.6 us, p99.9 1485 us, p99.99 2453 us
+- Draining the whole fired slot in one call is what produces the 1.5 ms tail; with a budget of 2
+  the tail stays within ~2x of the plain LRU's own (dict-resize and GC) tail. The max latency
+  (hundreds of ms) is the same dict resize in every variant, not expiry.
+- Hence the default `budget=2`. The `put`-when-full path always makes progress regardless, so
+  housekeeping cannot fall permanently behind on a full cache.
+"""
+
+
+class TTLNode(Node):
+    __slots__ = ('expires', 'bucket')
+
+    def __init__(self, key, value, expires=None):
+        """Initialize a node with an absolute expiry time (None = never expires)."""
+        super().__init__(key, value)
+        self.expires = expires
+        self.bucket = None  # Timer-wheel slot dict holding this node, if scheduled
+
+
+class TimerWheel:
+    BITS = 6
+    SLOTS = 1 << BITS
+
+    def __init__(self, on_expire, now: float, tick: float = 1.0, levels: int = 4):
+        """
+        Initialize a hierarchical timer wheel.
+
+        Args:
+            on_expire (callable): Called with each node whose `expires` time has passed.
+            now (float): Current time, in the same units as `expires`.
+            tick (float): Resolution of the wheel (seconds per level-0 slot).
+            levels (int): Number of levels; the wheel spans 64 ** levels ticks before clamping.
+        """
+        self.on_expire = on_expire
+        self.tick = tick
+        self.levels = levels
+        self.current = int(now // tick)  # Last tick processed
+        self.wheel = [[{} for _ in range(self.SLOTS)] for _ in range(levels)]
+        self.pending = []  # Fired slots still to be drained
+        self.count = 0     # Nodes held in the wheel, scheduled or pending
+
+    def schedule(self, node):
+        """Place a node into the slot covering its expiry tick."""
+        delta = max(int(node.expires // self.tick) - self.current, 1)
+        level = 0
+        while level < self.levels - 1 and delta >= self.SLOTS << (self.BITS * level):
+            level += 1
+        shift = self.BITS * level
+        if delta >= self.SLOTS << shift:  # Beyond the top level: park in its farthest slot
+            index = ((self.current >> shift) - 1) & (self.SLOTS - 1)
+        else:
+            index = ((self.current + delta) >> shift) & (self.SLOTS - 1)
+        bucket = self.wheel[level][index]
+        bucket[node.key] = node
+        node.bucket = bucket
+        self.count += 1
+
+    def cancel(self, node):
+        """Remove a node from the wheel if it is scheduled."""
+        if node.bucket is not None:
+            del node.bucket[node.key]
+            node.bucket = None
+            self.count -= 1
+
+    def _fire(self):
+        """Advance one tick, queueing the slots that fall due on it."""
+        self.current += 1
+        tick, mask = self.current, self.SLOTS - 1
+        for level in range(self.levels):
+            shift = self.BITS * level
+            if level and tick & ((1 << shift) - 1):
+                break  # Higher levels only fire when all lower bits wrap to zero
+            index = (tick >> shift) & mask
+            bucket = self.wheel[level][index]
+            if bucket:
+                self.wheel[level][index] = {}
+                self.pending.append(bucket)
+
+    def advance(self, now: float, budget: int, want: int = 0) -> int:
+        """
+        Process due ticks and nodes, spending at most `budget` units of work, but keep going
+        (while anything is due) until at least `want` nodes have expired.
+
+        Returns:
+            int: Number of nodes expired.
+        """
+        target = int(now // self.tick)
+        expired = 0
+        while budget > 0 or expired < want:
+            if self.pending:
+                bucket = self.pending[-1]
+                if not bucket:
+                    self.pending.pop()
+                    continue
+                _, node = bucket.popitem()
+                node.bucket = None
+                self.count -= 1
+                if node.expires <= now:
+                    self.on_expire(node)
+                    expired += 1
+                else:
+                    self.schedule(node)  # Cascade into a finer slot
+            elif self.current < target:
+                if not self.count:
+                    self.current = target  # Nothing scheduled: jump straight to now
+                    continue
+                self._fire()
+            else:
+                break
+            budget -= 1
+        return expired
+
+
+class TTLLRUCache(LRUCache):
+    def __init__(self, capacity: int, default_ttl: float = None, tick: float = 1.0,
+                 budget: int = 2, clock=time.monotonic):
+        """
+        Initialize an LRU cache whose entries can expire.
+
+        Args:
+            capacity (int): Maximum number of key-value pairs the cache can hold.
+            default_ttl (float): TTL in seconds for `put` calls that pass none (None = never expire).
+            tick (float): Timer-wheel resolution in seconds.
+            budget (int): Housekeeping work allowed per `get` / `put`.
+            clock (callable): Returns the current time in seconds.
+        """
+        super().__init__(capacity)
+        self.default_ttl = default_ttl
+        self.budget = budget
+        self.clock = clock
+        self.wheel = TimerWheel(self._expire, clock(), tick)
+
+    def _expire(self, node):
+        """Drop an expired node from the list and the hash map (the wheel has already let go of it)."""
+        self.remove(node)
+        del self.cache[node.key]
+
+    def expire(self) -> int:
+        """Expire every entry that is due now. Returns how many were removed."""
+        return self.wheel.advance(self.clock(), budget=0, want=len(self.cache) + 1)
+
+    def get(self, key: int) -> int:
+        """
+        Get the value of the key if it exists and has not expired, move it to MRU, else return -1.
+        """
+        now = self.clock()
+        self.wheel.advance(now, self.budget)
+        node = self.cache.get(key)
+        if node is None:
+            return -1
+        if node.expires is not None and node.expires <= now:
+            self.wheel.cancel(node)
+            self._expire(node)
+            return -1
+        self.remove(node)
+        self.insert(node)
+        return node.val
+
+    def put(self, key: int, value: int, ttl: float = None) -> None:
+        """
+        Insert or update a key-value pair that expires after `ttl` seconds (or `default_ttl`).
+        Expired entries are reclaimed before the live LRU entry is evicted.
+        """
+        now = self.clock()
+        self.wheel.advance(now, self.budget)
+        if ttl is None:
+            ttl = self.default_ttl
+        expires = None if ttl is None else now + ttl
+
+        node = self.cache.get(key)
+        if node is not None:
+            self.wheel.cancel(node)
+            node.val = value
+            self.remove(node)
+        elif len(self.cache) < self.cap:
+            node = TTLNode(key, value)
+        elif self.cache:
+            lru = self.left.next
+            lru_expired = lru.expires is not None and lru.expires <= now
+            if not lru_expired and self.wheel.advance(now, 0, want=1):
+                node = TTLNode(key, value)  # An expired entry gave up its slot
+            else:
+                # Nothing expired elsewhere (or the LRU itself is expired): recycle the LRU node
+                node = lru
+                self.wheel.cancel(node)
+                self._expire(node)
+                node.key, node.val = key, value
+        else:
+            return  # Capacity 0 holds nothing
+
+        node.expires = expires
+        if expires is not None:
+            self.wheel.schedule(node)
+        self.cache[key] = node
+        self.insert(node)
+
+    def get_many(self, keys) -> list:
+        """Batch `get`; every key goes through the expiry checks."""
+        return [self.get(key) for key in keys]
+
+    def put_many(self, items, ttl: float = None) -> None:
+        """Batch `put`, all with the same `ttl`."""
+        for key, value in items:
+            self.put(key, value, ttl)
+
+
+"""
+Follow-up: Weight-Budgeted LRU Cache
+------------------------------------
+Goal: Bound the cache by total size (e.g. bytes) instead of entry count.
+
+Why?
+- `len(self.cache) > self.cap` treats a 50-byte value and a 5 MB value the same, so a count limit
+  says nothing about memory use when value sizes vary by five orders of magnitude.
+
+Logic of Solution:
+1. Weights:
+   - Each node stores its `weight`, taken from the `weight` argument of `put`, else from the
+     `weigher(key, value)` callable, else 1.
+   - `self.weight` is the running total, updated on every insert / overwrite / eviction, so reading
+     the current weight is O(1) and never walks the list.
+2. Put:
+   - An entry heavier than `max_entry_weight` (or than the whole budget) is not cached; any older value
+     under that key is dropped so a stale value is never served.
+   - On overwrite, the old weight is subtracted first.
+   - Then nodes are evicted from the LRU end (after `left`) until the new entry fits in `max_weight`.
+3. Get:
+   - Unchanged from `LRUCache`.
+
+Time and Space Complexity:
+- Time Complexity: O(1) for `get`; O(1) amortized for `put` (each evicted entry was inserted once).
+- Space Complexity: O(number of entries), bounded by `max_weight` / lightest entry.
+"""
+
+
+class WeightedNode(Node):
+    __slots__ = ('weight',)
+
+    def __init__(self, key, value, weight):
+        """Initialize a node that remembers its weight."""
+        super().__init__(key, value)
+        self.weight = weight
+
+
+class WeightedLRUCache(LRUCache):
+    def __init__(self, max_weight: int, weigher=None, max_entry_weight: int = None):
+        """
+        Initialize an LRU cache bounded by total weight.
+
+        Args:
+            max_weight (int): Budget for the sum of all entry weights (e.g. bytes).
+            weigher (callable): `weigher(key, value) -> int`, used when `put` is not given a weight.
+            max_entry_weight (int): Entries heavier than this are never cached (default: `max_weight`).
+        """
+        super().__init__(capacity=max_weight)
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.max_entry_weight = max_weight if max_entry_weight is None else min(max_entry_weight, max_weight)
+        self.weight = 0  # Current total weight
+
+    def _drop(self, node):
+        """Unlink a node and forget its key and weight."""
+        self.remove(node)
+        del self.cache[node.key]
+        self.weight -= node.weight
+
+    def put(self, key: int, value: int, weight: int = None) -> None:
+        """
+        Insert or update a key-value pair, evicting from the LRU end until it fits the weight budget.
+
+        Args:
+            key (int): Key to insert or update.
+            value (int): Value associated with the key.
+            weight (int): Weight of this entry; defaults to `weigher(key, value)` or 1.
+        """
+        if weight is None:
+            weight = self.weigher(key, value) if self.weigher else 1
+        node = self.cache.get(key)
+        if node is not None:
+            self._drop(node)  # Re-added below with its new weight
+        if weight > self.max_entry_weight:
+            return  # Too large to cache
+
+        while self.weight + weight > self.max_weight:
+            self._drop(self.left.next)  # LRU is just after left
+
+        if node is None:
+            node = WeightedNode(key, value, weight)
+        else:
+            node.val, node.weight = value, weight
+        self.cache[key] = node
+        self.insert(node)
+        self.weight += weight
+
+    def put_many(self, items) -> None:
+        """Batch `put`; each entry is weighed and may evict on its own."""
+        for key, value in items:
+            self.put(key, value)
+
+
+"""
+Follow-up: get_or_load with Single-Flight Loading (Threads and asyncio)
+-----------------------------------------------------------------------
+Goal: On a miss, load the value once no matter how many callers miss on the same key at the same time.
+
+Why?
+- With plain `get` + `put`, N concurrent misses on a hot key call the backing store N times (a
+  thundering herd) and then `put` the same value N times.
+
+Logic of Solution:
+1. In-Flight Table:
+   - `inflight` maps key -> Future of the load currently running for it.
+   - The first caller to miss creates the Future and runs `loader(key)`; later callers find the Future
+     and wait on it. When the load finishes the value is `put` and the Future resolved (or failed, in
+     which case every waiter sees the same exception and nothing is cached).
+2. Threaded Flavor (LoadingCache):
+   - One lock guards the cache and the in-flight table; the loader itself runs outside the lock.
+3. asyncio Flavor (AsyncLoadingCache):
+   - The event loop is single-threaded, so no lock is needed. The load is an `asyncio.Task`, and waiters
+     `await asyncio.shield(task)` so one cancelled waiter does not cancel the load for everyone.
+4. Refresh-Ahead (optional, needs a `TTLLRUCache`):
+   - On a hit whose entry expires within `refresh_ahead` seconds, start a background reload (executor
+     thread / asyncio task) unless one is already in flight, and keep returning the current value.
+   - Hot keys are then reloaded before they expire and never produce a miss.
+   - Nobody waits on a background reload, so a done-callback consumes its outcome: a failed refresh
+     is counted in `refresh_failures` (the stale value keeps being served until it expires) instead
+     of leaving an unretrieved exception behind.
+
+Notes:
+- As with `get`, -1 means "missing", so a loader must not return -1 as a real value.
+
+Time and Space Complexity:
+- Time Complexity: O(1) cache work per call, plus one `loader` call per key per miss burst.
+- Space Complexity: O(capacity) plus O(keys being loaded) for the in-flight table.
+"""
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+def _check_refresh_cache(cache, refresh_ahead):
+    """Refresh-ahead reads entry expiry times, which only a `TTLLRUCache` keeps."""
+    if refresh_ahead is not None and not isinstance(cache, TTLLRUCache):
+        raise ValueError(f"refresh_ahead needs a TTLLRUCache, got {type(cache).__name__}")
+
+
+class LoadingCache:
+    def __init__(self, cache, ttl: float = None, refresh_ahead: float = None, executor=None):
+        """
+        Wrap a cache with thread-safe, single-flight `get_or_load`.
+
+        Args:
+            cache: Any cache with `get` / `put`; a `TTLLRUCache` when `ttl` or `refresh_ahead` is used.
+            ttl (float): TTL passed to `put` for loaded values.
+            refresh_ahead (float): Reload entries in the background when they expire within this many seconds.
+            executor: Executor for refresh-ahead loads (a small thread pool is created if needed).
+        """
+        _check_refresh_cache(cache, refresh_ahead)
+        self.cache = cache
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.executor = executor
+        self.lock = threading.Lock()
+        self.inflight = {}  # key -> Future
+        self.refresh_failures = 0  # Background reloads whose loader raised
+
+    def _store(self, key, value):
+        if self.ttl is None:
+            self.cache.put(key, value)
+        else:
+            self.cache.put(key, value, self.ttl)
+
+    def _expiring(self, key):
+        """True if `key` is cached but expires within `refresh_ahead` seconds."""
+        node = self.cache.cache.get(key)
+        return node.expires is not None and node.expires - self.cache.clock() <= self.refresh_ahead
+
+    def _load(self, key, loader, future):
+        """Run the loader for an in-flight Future and publish the result."""
+        try:
+            value = loader(key)
+        except BaseException as e:
+            with self.lock:
+                del self.inflight[key]
+            future.set_exception(e)
+            return
+        with self.lock:
+            self._store(key, value)
+            del self.inflight[key]
+        future.set_result(value)
+
+    def _refresh_done(self, future):
+        """Done-callback for refresh-ahead loads: consume a failure and count it."""
+        if not future.cancelled() and future.exception() is not None:
+            with self.lock:
+                self.refresh_failures += 1
+
+    def get(self, key: int) -> int:
+        with self.lock:
+            return self.cache.get(key)
+
+    def put(self, key: int, value: int) -> None:
+        with self.lock:
+            self._store(key, value)
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value for `key`, or load it with `loader(key)` exactly once across
+        all threads that miss concurrently.
+        """
+        with self.lock:
+            value = self.cache.get(key)
+            future = self.inflight.get(key)
+            if value != -1:
+                if self.refresh_ahead is not None and future is None and self._expiring(key):
+                    future = self.inflight[key] = Future()
+                    future.add_done_callback(self._refresh_done)
+                    if self.executor is None:
+                        self.executor = ThreadPoolExecutor(max_workers=4)
+                    self.executor.submit(self._load, key, loader, future)
+                return value
+            owner = future is None
+            if owner:
+                future = self.inflight[key] = Future()
+        if owner:
+            self._load(key, loader, future)
+        return future.result()
+
+
+class AsyncLoadingCache:
+    def __init__(self, cache, ttl: float = None, refresh_ahead: float = None):
+        """
+        Wrap a cache with single-flight `get_or_load` for asyncio code (one event loop).
+
+        Args:
+            cache: Any cache with `get` / `put`; a `TTLLRUCache` when `ttl` or `refresh_ahead` is used.
+            ttl (float): TTL passed to `put` for loaded values.
+            refresh_ahead (float): Reload entries in the background when they expire within this many seconds.
+        """
+        _check_refresh_cache(cache, refresh_ahead)
+        self.cache = cache
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.inflight = {}  # key -> asyncio.Task
+        self.refresh_failures = 0  # Background reloads whose loader raised
+
+    _store = LoadingCache._store
+    _expiring = LoadingCache._expiring
+
+    async def _load(self, key, loader):
+        try:
+            value = await loader(key)
+            self._store(key, value)
+            return value
+        finally:
+            del self.inflight[key]
+
+    def _refresh_done(self, task):
+        """Done-callback for refresh-ahead tasks: retrieve a failure so it is not logged, and count it."""
+        if not task.cancelled() and task.exception() is not None:
+            self.refresh_failures += 1
+
+    async def get_or_load(self, key, loader):
+        """
+        Return the cached value for `key`, or await `loader(key)` (a coroutine function) exactly
+        once across all tasks that miss concurrently.
+        """
+        value = self.cache.get(key)
+        task = self.inflight.get(key)
+        if value != -1:
+            if self.refresh_ahead is not None and task is None and self._expiring(key):
+                task = self.inflight[key] = asyncio.ensure_future(self._load(key, loader))
+                task.add_done_callback(self._refresh_done)
+            return value
+        if task is None:
+            task = self.inflight[key] = asyncio.ensure_future(self._load(key, loader))
+        return await asyncio.shield(task)
+
+
+"""
+Follow-up: Hit/Miss/Eviction Instrumentation
+--------------------------------------------
+Goal: See how a cache behaves in production (hit rate, churn, latency) without slowing down the
+caches that do not ask for it.
+
+Logic of Solution:
+1. Opt-In by Type:
+   - Statistics live in a subclass, `InstrumentedLRUCache`. A plain `LRUCache` has no counters and no
+     checks at all, so the disabled path costs exactly nothing.
+2. Counters (CacheStats):
+   - `hits`, `misses` from `get`; `inserts`, `overwrites`, `evictions` from `put` (an eviction is a new
+     key arriving while the cache is full).
+3. Sampled Latency Histogram:
+   - Every `sample_every`-th operation is timed with `perf_counter_ns`, using a countdown so unsampled
+     operations pay one decrement and one comparison.
+   - Buckets are powers of two: a latency of t ns lands in bucket `t.bit_length()`, i.e. (2^(b-1), 2^b] ns.
+     64 buckets cover everything, and percentiles can be read off the bucket counts.
+4. List Time (optional):
+   - With `time_list_ops=True`, `remove` / `insert` are swapped for timed versions on that instance only,
+     accumulating `list_ns`. It costs two clock reads per list operation, so it is off by default.
+5. Scraping:
+   - `stats.snapshot()` returns a plain dict (counters, hit rate, histogram, p50/p99 estimates);
+     `stats.reset()` zeroes everything, and `snapshot(reset=True)` does both at once.
+
+Time and Space Complexity:
+- Time Complexity: O(1) extra per operation.
+- Space Complexity: O(1) (a fixed 64-bucket histogram).
+
+Benchmark (`benchmark_stats`, capacity 100K, 1M get/put-on-miss ops over 200K keys, 3 runs, CPython 3.11):
+- LRUCache (stats off):      0.77-0.86 M ops/s
+- Counters only:             0.48-0.56 M ops/s
+- Counters + 1/100 sampling: 0.53-0.72 M ops/s
+- Counters + every op timed: 0.34-0.49 M ops/s
+- 1/100 + list time:         0.39-0.42 M ops/s
+- Most of the ~30% counter overhead is the extra method layer (`super()` call) and the extra dict probe in
+  `put`; the 1/100 sampler itself is lost in the run-to-run noise. Keep `time_list_ops` for short
+  diagnostic runs only.
+"""
+
+
+class CacheStats:
+    def __init__(self):
+        """Initialize zeroed counters and latency histogram."""
+        self.reset()
+
+    def reset(self):
+        """Zero every counter and the histogram."""
+        self.hits = self.misses = 0
+        self.inserts = self.overwrites = self.evictions = 0
+        self.list_ns = 0
+        self.histogram = [0] * 65  # Bucket b counts sampled latencies in (2^(b-1), 2^b] ns
+
+    def record_latency(self, ns):
+        self.histogram[ns.bit_length()] += 1
+
+    def percentile(self, q):
+        """Upper bound (ns) of the histogram bucket holding the q-th quantile, or 0 if nothing sampled."""
+        total = sum(self.histogram)
+        if not total:
+            return 0
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= q * total:
+                return 1 << bucket
+        return 1 << 64
+
+    def snapshot(self, reset=False):
+        """
+        Return all statistics as a plain dict, optionally resetting them afterwards.
+        """
+        lookups = self.hits + self.misses
+        snap = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "inserts": self.inserts,
+            "overwrites": self.overwrites,
+            "evictions": self.evictions,
+            "list_ns": self.list_ns,
+            "latency_histogram_ns": {1 << b: c for b, c in enumerate(self.histogram) if c},
+            "latency_p50_ns": self.percentile(0.5),
+            "latency_p99_ns": self.percentile(0.99),
+        }
+        if reset:
+            self.reset()
+        return snap
+
+
+class InstrumentedLRUCache(LRUCache):
+    def __init__(self, capacity: int, sample_every: int = 100, time_list_ops: bool = False):
+        """
+        Initialize an LRU Cache that records statistics.
+
+        Args:
+            capacity (int): Maximum number of key-value pairs the cache can hold.
+            sample_every (int): Time one operation out of every `sample_every` (0 disables latency sampling).
+            time_list_ops (bool): Also accumulate time spent in `remove` / `insert`.
+        """
+        super().__init__(capacity)
+        self.stats = CacheStats()
+        self.sample_every = sample_every
+        self.countdown = sample_every or -1  # Never reaches 0 when sampling is off
+        if time_list_ops:
+            self.remove, self.insert = self._timed(self.remove), self._timed(self.insert)
+
+    def _timed(self, method):
+        stats, clock = self.stats, time.perf_counter_ns
+
+        def timed(node):
+            start = clock()
+            method(node)
+            stats.list_ns += clock() - start
+        return timed
+
+    def get(self, key: int) -> int:
+        """`LRUCache.get`, counting hits and misses."""
+        self.countdown -= 1
+        if self.countdown:
+            value = super().get(key)
+        else:
+            self.countdown = self.sample_every
+            start = time.perf_counter_ns()
+            value = super().get(key)
+            self.stats.record_latency(time.perf_counter_ns() - start)
+        if value == -1:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def put(self, key: int, value: int) -> None:
+        """`LRUCache.put`, counting inserts, overwrites and evictions."""
+        stats = self.stats
+        if key in self.cache:
+            stats.overwrites += 1
+        else:
+            stats.inserts += 1
+            if 0 < self.cap <= len(self.cache):
+                stats.evictions += 1
+        self.countdown -= 1
+        if self.countdown:
+            super().put(key, value)
+        else:
+            self.countdown = self.sample_every
+            start = time.perf_counter_ns()
+            super().put(key, value)
+            stats.record_latency(time.perf_counter_ns() - start)
+
+    def get_many(self, keys) -> list:
+        """Batch `get`; every key is counted."""
+        return [self.get(key) for key in keys]
+
+    def put_many(self, items) -> None:
+        """Batch `put`; every entry is counted."""
+        for key, value in items:
+            self.put(key, value)
+
+
+"""
+Follow-up: Snapshot and Warm-Start Persistence
+----------------------------------------------
+Goal: Dump an `LRUCache` to disk in recency order and reload it at startup, so a restart does not
+begin with an empty cache.
+
+File Format (little-endian):
+- 8-byte magic `b"LRUSNAP1"`, 8-byte entry count `n`.
+- `n` int64 keys, then `n` int64 values, both ordered LRU -> MRU.
+- 16 bytes per entry and no per-entry framing. Keys and values must be ints that fit in 64 bits,
+  as in the problem constraints.
+
+Logic of Solution:
+1. Dump (`save_snapshot`):
+   - Walk the list from `left` to `right`, appending keys / values to two `array('q')` buffers, then write
+     both buffers with `tofile` (two large writes instead of `n` small ones).
+2. Copy-on-Write Dump (`save_snapshot_background`):
+   - The walk above blocks `get` / `put` for as long as it takes (~1 s for 5M entries).
+   - On POSIX, `os.fork()` instead: the child gets a copy-on-write image of the whole cache frozen at
+     that instant, writes the snapshot and exits, while the parent returns immediately and keeps
+     serving. The parent only pays for the fork itself (copying page tables, not data).
+   - The child writes to `path + ".tmp"` and renames, so a reader never sees a half-written file.
+3. Warm Start (`load_snapshot`):
+   - `mmap` the file and cast the two halves to int64 memoryviews (zero-copy).
+   - If the new capacity is smaller than the snapshot, only the MRU-most `capacity` entries are kept.
+   - Nodes are created and chained in order directly (the dumped keys are unique), so no `put`
+     logic, dict probe-before-insert or eviction runs during the load.
+   - The cyclic GC is paused while the nodes are created: every allocation burst would otherwise
+     trigger a collection that re-traverses all the nodes built so far.
+
+Time and Space Complexity:
+- Dump / load: O(n) time; the dump needs 16 bytes per entry of temporary buffers.
+- Background dump: O(page tables) stall in the parent; memory grows only by pages the parent
+  writes while the child is still running.
+
+Benchmark (`benchmark_snapshot`, 5M int entries, 76 MiB file, CPython 3.11):
+- save_snapshot (blocking):        1.3-1.8 s
+- save_snapshot_background:        parent stalled ~6 ms, child finished after ~2.1 s
+- load_snapshot:                   2.8 s (7.0 s before pausing the GC during the load)
+- Caveats: CPython reference counting writes to every object the parent touches, so pages of hot
+  entries get copied while the child runs. Fork only from a process whose other threads hold no
+  locks the child needs (the child here only walks the list and writes a file).
+"""
+import gc
+import mmap
+import os
+import struct
+
+SNAPSHOT_MAGIC = b"LRUSNAP1"
+
+
+def save_snapshot(cache: LRUCache, path: str) -> int:
+    """
+    Write `cache` to `path` in LRU -> MRU order. Returns the number of entries written.
+    """
+    keys, vals = array('q'), array('q')
+    node, right = cache.left.next, cache.right
+    while node is not right:
+        keys.append(node.key)
+        vals.append(node.val)
+        node = node.next
+    if sys.byteorder != 'little':
+        keys.byteswap()
+        vals.byteswap()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(SNAPSHOT_MAGIC + struct.pack("<Q", len(keys)))
+        keys.tofile(f)
+        vals.tofile(f)
+    os.replace(tmp, path)
+    return len(keys)
+
+
+def save_snapshot_background(cache: LRUCache, path: str):
+    """
+    Snapshot `cache` from a forked child (copy-on-write), returning the child's pid without waiting.
+    Falls back to a blocking `save_snapshot` (returning None) where `fork` is unavailable.
+    """
+    if not hasattr(os, "fork"):
+        save_snapshot(cache, path)
+        return None
+    pid = os.fork()
+    if pid == 0:  # Child: the cache is frozen as of the fork
+        status = 1
+        try:
+            save_snapshot(cache, path)
+            status = 0
+        finally:
+            os._exit(status)
+    return pid
+
+
+def load_snapshot(path: str, capacity: int = None) -> LRUCache:
+    """
+    Build an `LRUCache` from a snapshot, preserving recency order.
+
+    Args:
+        path (str): Snapshot written by `save_snapshot`.
+        capacity (int): Capacity of the new cache (default: the number of entries in the snapshot).
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:8] != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not an LRU snapshot")
+        (n,) = struct.unpack_from("<Q", mm, 8)
+        if len(mm) != 16 + 16 * n:
+            raise ValueError(f"{path} is truncated")
+        view = memoryview(mm)
+        keys, vals = view[16:16 + 8 * n].cast('q'), view[16 + 8 * n:].cast('q')
+        if sys.byteorder != 'little':
+            keys, vals = array('q', keys), array('q', vals)
+            keys.byteswap()
+            vals.byteswap()
+
+        cache = LRUCache(n if capacity is None else capacity)
+        start = max(0, n - cache.cap)  # Keep only the MRU-most entries that fit
+        table, prev = cache.cache, cache.left
+        gc_was_enabled = gc.isenabled()
+        gc.disable()  # Millions of new nodes would otherwise trigger repeated full collections
+        try:
+            for key, value in zip(keys[start:].tolist(), vals[start:].tolist()):
+                node = Node(key, value)
+                node.prev, prev.next = prev, node
+                table[key] = node
+                prev = node
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        prev.next, cache.right.prev = cache.right, prev
+        del keys, vals, view  # Release the buffer exports before the mmap closes
+    return cache
+
+
+"""
+Follow-up: Cross-Process Shared-Memory LRU Cache
+------------------------------------------------
+Goal: One cache per host, shared by every worker process, with the same `get`/`put` semantics.
+
+Why?
+- With one `LRUCache` per worker, 32 workers hold 32 copies of the hot set, and a value loaded by one
+  worker is a miss for the other 31.
+
+Logic of Solution:
+1. Everything Lives in One `multiprocessing.shared_memory` Segment:
+   - Python objects cannot be shared between processes, so keys and values are int64 (as in the problem
+     constraints) and the whole structure is a flat int64 array viewed through a `memoryview`.
+   - Links are slot numbers, exactly as in `ArrayLRUCache`. Slot 0 of each shard is its sentinel
+     (`next` = LRU, `prev` = MRU); 0 also means "null", so freshly zeroed memory is a valid empty cache.
+2. Shards with Their Own Locks (Fine-Grained Locking):
+   - `get` relinks the list, so every operation is a write; one lock for the whole cache would serialize
+     all workers. Keys are split over `shards` independent regions, each with its own
+     `multiprocessing.Lock`, hash index, recency list and slots.
+3. Per-Shard Layout (int64 words):
+   - Header: `[size]` (slots handed out so far).
+   - Hash index: `buckets` words, each the first slot of a chain (0 = empty).
+   - Slots: `SLOT` words per slot: key, value, prev, next, chain (next slot in the same bucket).
+4. Hashing:
+   - `hash()` is only stable across processes for ints, so keys are mixed with a fixed 64-bit
+     multiplier; the high bits pick the shard and the bucket.
+5. Get / Put:
+   - Walk the bucket chain for the key; move a hit to MRU.
+   - A new key takes the next unused slot, or, when the shard is full, the LRU slot (unlinked from its
+     bucket chain and the list first), like the recycling `LRUCache.put`.
+6. Sharing:
+   - Create the cache once in the parent and hand it to the workers (`multiprocessing.Process` args):
+     it pickles as (segment name, locks, geometry) and re-attaches on the other side.
+   - Every process calls `close()` when done; the creator also calls `unlink()`.
+
+Time and Space Complexity:
+- Time Complexity: O(1) expected for `get` / `put` (bucket chains stay short: 2 buckets per slot).
+- Space Complexity: 40 bytes per slot plus up to 32 bytes of hash index per slot, shared by all processes.
+
+Benchmark (`benchmark_shared`, capacity 100K, 100K zipfian ops per worker over 1M keys, each worker its own
+trace; measured on a 1-core sandbox, so throughput cannot scale with workers here):
+- Workers:              1       4       8       32
+- Private, M ops/s:     0.91    0.84    0.99    0.89
+- Shared,  M ops/s:     0.21    0.27    0.27    0.22
+- Private, hit rate:    62.5%   62.6%   62.6%   62.6%
+- Shared,  hit rate:    62.5%   72.0%   75.0%   77.2%
+- Cache memory:         14.1 MiB per private cache (452.7 MiB for 32) vs 5.8 MiB shared in total.
+- Each shared operation costs ~4x a private one (memoryview word access plus a semaphore per call), so the
+  shared cache pays off when a miss is expensive: here it removes 25-40% of the misses and 98% of the memory.
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+
+
+class SharedLRUCache:
+    SLOT = 5                  # Words per slot: +0 key, +1 value, +2 prev, +3 next, +4 chain
+    MIX = 0x9E3779B97F4A7C15  # 64-bit multiplicative hash constant
+
+    def __init__(self, capacity: int, shards: int = 16, name: str = None):
+        """
+        Create a shared-memory LRU cache.
+
+        Args:
+            capacity (int): Total number of key-value pairs, split evenly across shards.
+            shards (int): Number of independently locked shards.
+            name (str): Optional name for the shared-memory segment.
+        """
+        self.shards = shards
+        self.shard_cap = max(1, -(-capacity // shards))
+        buckets = 1
+        while buckets < 2 * self.shard_cap:
+            buckets <<= 1
+        self.buckets = buckets
+        self.shard_words = 1 + buckets + (self.shard_cap + 1) * self.SLOT
+        self.locks = [multiprocessing.Lock() for _ in range(shards)]
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=8 * self.shard_words * shards)
+        self.words = self.shm.buf.cast('q')  # Zero-filled: every shard starts empty
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["shm"] = self.shm.name
+        del state["words"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.shm = shared_memory.SharedMemory(name=state["shm"])
+        self.words = self.shm.buf.cast('q')
+
+    def close(self):
+        """Detach this process from the segment."""
+        self.words.release()
+        self.shm.close()
+
+    def unlink(self):
+        """Destroy the segment (creator only, after every process has closed it)."""
+        self.shm.unlink()
+
+    def _locate(self, key):
+        """Return (shard index, shard base word, bucket word) for `key`."""
+        h = ((key * self.MIX) & 0xFFFFFFFFFFFFFFFF) >> 16
+        shard = h % self.shards
+        base = shard * self.shard_words
+        return shard, base, base + 1 + ((h // self.shards) & (self.buckets - 1))
+
+    def _find(self, w, slots, bucket, key):
+        """Slot holding `key` in this bucket chain, or 0."""
+        size, slot = self.SLOT, w[bucket]
+        while slot and w[slots + slot * size] != key:
+            slot = w[slots + slot * size + 4]
+        return slot
+
+    def _unlink(self, w, slots, slot):
+        """Remove `slot` from its shard's recency list."""
+        size = self.SLOT
+        at = slots + slot * size
+        prev, nxt = w[at + 2], w[at + 3]
+        w[slots + prev * size + 3] = nxt
+        w[slots + nxt * size + 2] = prev
+
+    def _link_mru(self, w, slots, slot):
+        """Insert `slot` at the MRU end, just before the sentinel (slot 0)."""
+        size, mru = self.SLOT, w[slots + 2]
+        w[slots + mru * size + 3] = slot
+        w[slots + 2] = slot
+        at = slots + slot * size
+        w[at + 2], w[at + 3] = mru, 0
+
+    def get(self, key: int) -> int:
+        """Return the value of `key` and make it MRU in its shard, or -1."""
+        # Same steps as _locate / _find / _unlink / _link_mru, inlined for the hot path
+        h = ((key * self.MIX) & 0xFFFFFFFFFFFFFFFF) >> 16
+        shard = h % self.shards
+        base = shard * self.shard_words
+        slots = base + 1 + self.buckets
+        w, size = self.words, self.SLOT
+        with self.locks[shard]:
+            slot = w[base + 1 + ((h // self.shards) & (self.buckets - 1))]
+            while slot and w[slots + slot * size] != key:
+                slot = w[slots + slot * size + 4]
+            if not slot:
+                return -1
+            at = slots + slot * size
+            mru = w[slots + 2]
+            if mru != slot:
+                prev, nxt = w[at + 2], w[at + 3]
+                w[slots + prev * size + 3] = nxt
+                w[slots + nxt * size + 2] = prev
+                w[slots + mru * size + 3] = slot
+                w[slots + 2] = slot
+                w[at + 2], w[at + 3] = mru, 0
+            return w[at + 1]
+
+    def put(self, key: int, value: int) -> None:
+        """Insert or update `key`, recycling the shard's LRU slot when the shard is full."""
+        shard, base, bucket = self._locate(key)
+        slots = base + 1 + self.buckets
+        w, size = self.words, self.SLOT
+        with self.locks[shard]:
+            slot = self._find(w, slots, bucket, key)
+            if slot:
+                self._unlink(w, slots, slot)
+            else:
+                if w[base] < self.shard_cap:
+                    w[base] += 1
+                    slot = w[base]
+                else:
+                    slot = w[slots + 3]  # LRU is just after the sentinel, recycle it
+                    self._unlink(w, slots, slot)
+                    at = slots + slot * size
+                    # Unlink the old key from its bucket chain
+                    _, _, old_bucket = self._locate(w[at])
+                    if w[old_bucket] == slot:
+                        w[old_bucket] = w[at + 4]
+                    else:
+                        link = w[old_bucket]
+                        while w[slots + link * size + 4] != slot:
+                            link = w[slots + link * size + 4]
+                        w[slots + link * size + 4] = w[at + 4]
+                at = slots + slot * size
+                w[at] = key
+                w[at + 4] = w[bucket]  # Push onto the bucket chain
+                w[bucket] = slot
+            w[slots + slot * size + 1] = value
+            self._link_mru(w, slots, slot)
+
+
+"""
+Follow-up: lru_memoize Decorator
+--------------------------------
+Goal: Memoize pure functions (e.g. `Solution` methods called repeatedly with the same input) with an
+`LRUCache`, without hand-written key glue.
+
+Logic of Solution:
+1. Keys:
+   - One positional `int` / `str` argument and no keywords: the argument itself is the key (no tuple).
+   - Otherwise the positional `args` tuple is tried as the key as-is; Python already built it for the
+     call, so a hit with hashable arguments allocates nothing.
+   - If that raises `TypeError` (a list such as `times`, `nums` or `grid`), unhashable arguments are
+     frozen. Hashable values stay as they are; every unhashable container becomes a `(tag, payload)` pair
+     with a private tag per type, so `f([1])`, `f((1,))` and `f({1})` never share an entry:
+     lists -> tuples (via C-level `tuple()` for flat lists and `map(tuple)` for lists of flat lists),
+     tuples holding lists -> tuples of frozen items, sets -> frozensets, dicts -> frozensets of items
+     (no sorting, so mixed-type keys such as `{1: 'a', 'b': 2}` work).
+   - Keyword arguments are appended (in call order, like `functools.lru_cache`) after a private marker
+     object, so `f(1, b=2)` and `f(1, 2)` differ.
+   - Freezing is exact. A lossy fingerprint (hash, length, sample) would be cheaper for huge lists, but a
+     collision would silently return another input's result.
+2. Lookups:
+   - The wrapper probes `cache.cache` (key -> Node) directly instead of `cache.get`, because `get`
+     answers -1 for "missing" and -1 is a legitimate result (e.g. `networkDelayTime`).
+   - A hit relinks the node to MRU; a miss calls the function and `put`s the result (recycling the LRU
+     node once full).
+3. Introspection:
+   - `f.cache_info()` -> `(hits, misses, maxsize, currsize)`, `f.cache_clear()` empties the cache and counters.
+4. Threads:
+   - Like `functools.lru_cache`, a lock guards the lookup + relink and the `put`, but not the call itself.
+     Two threads missing on the same key may both run the function; the later `put` just updates the entry.
+
+Time and Space Complexity:
+- Time Complexity: O(1) per hit with hashable args; O(size of the list arguments) to freeze them.
+- Space Complexity: O(maxsize) keys and results.
+
+Benchmark (`benchmark_memoize`, cost per cache hit, CPython 3.11):
+- f(int):           functools.lru_cache  67 ns | lru_memoize  406 ns
+- f(int, int):      functools.lru_cache  76 ns | lru_memoize  446 ns
+- f(int, k=int):    functools.lru_cache 171 ns | lru_memoize  811 ns
+- f(4x4 grid):      functools.lru_cache (TypeError) | lru_memoize 3269 ns
+- `functools.lru_cache` is implemented in C, so on hashable arguments it stays ~5-6x cheaper per hit.
+- The lock costs ~150 ns per hit (262 ns for f(int) unlocked on the same run). Bound `acquire` /
+  `release` instead of `with lock` halves that.
+  `lru_memoize` is for what it cannot do: list arguments, -1-safe results on this repo's `LRUCache`, and
+  a cache that can be swapped for the other implementations in this file.
+- Inlining the relink and trying the unfrozen key first brought f(int) down from 781 ns,
+  f(int, k=int) from 3351 ns and the grid from 5854 ns.
+"""
+import functools
+from collections import namedtuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+_KWARGS = object()  # Separates positional args from keyword items in a key
+# Type tags for frozen containers; user values can never contain these objects
+_LIST, _ROWS, _TUPLE, _SET, _DICT = (object() for _ in range(5))
+
+
+def _freeze(value):
+    """Hashable, exact stand-in for a possibly unhashable argument."""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+    if isinstance(value, list):
+        frozen = tuple(value)
+        try:
+            hash(frozen)
+            return _LIST, frozen
+        except TypeError:
+            pass
+        if all(type(v) is list for v in value):  # Rows of a grid / edge list: one C-level pass
+            frozen = tuple(map(tuple, value))
+            try:
+                hash(frozen)
+                return _ROWS, frozen
+            except TypeError:
+                pass
+        return _LIST, tuple(map(_freeze, value))
+    if isinstance(value, tuple):
+        return _TUPLE, tuple(map(_freeze, value))
+    if isinstance(value, (set, frozenset)):
+        return _SET, frozenset(map(_freeze, value))
+    if isinstance(value, dict):
+        return _DICT, frozenset((k, _freeze(v)) for k, v in value.items())
+    return value
+
+
+def lru_memoize(maxsize=128):
+    """
+    Decorator: memoize a function in an `LRUCache` of `maxsize` entries (None = unbounded).
+
+    Usable as `@lru_memoize`, `@lru_memoize()` or `@lru_memoize(maxsize=1024)`.
+    """
+    if callable(maxsize):  # Bare @lru_memoize
+        return lru_memoize()(maxsize)
+
+    def decorator(func):
+        cache = LRUCache(float('inf') if maxsize is None else maxsize)
+        table, right, put = cache.cache, cache.right, cache.put
+        stats = [0, 0]  # hits, misses
+        fast_types = {int, str}
+        lock = threading.Lock()
+        acquire, release = lock.acquire, lock.release  # Bound methods: cheaper than `with lock` per hit
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if kwargs:
+                key = args + (_KWARGS,) + tuple(kwargs.items())
+            elif len(args) == 1 and type(args[0]) in fast_types:
+                key = args[0]
+            else:
+                key = args
+            try:
+                hash(key)
+            except TypeError:  # Unhashable argument: freeze (outside the lock)
+                key = tuple(map(_freeze, args))
+                if kwargs:
+                    key += (_KWARGS,) + tuple((k, _freeze(v)) for k, v in kwargs.items())
+            acquire()
+            try:
+                node = table.get(key)
+                if node is not None:
+                    stats[0] += 1
+                    if node is not right.prev:  # Inline remove + insert at MRU
+                        prev, nxt = node.prev, node.next
+                        prev.next, nxt.prev = nxt, prev
+                        last = right.prev
+                        last.next, right.prev = node, node
+                        node.prev, node.next = last, right
+                    return node.val
+                stats[1] += 1
+            finally:
+                release()
+            result = func(*args, **kwargs)
+            with lock:  # Updates in place if another thread stored the key meanwhile
+                put(key, result)
+            return result
+
+        def cache_info():
+            with lock:
+                return CacheInfo(stats[0], stats[1], maxsize, len(table))
+
+        def cache_clear():
+            with lock:
+                table.clear()
+                cache.left.next, cache.right.prev = cache.right, cache.left
+                stats[0] = stats[1] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+def _shared_worker(cache, key, factor):
+    """Test helper run in a child process: read `key` and publish `value * factor` under `key + 1`."""
+    cache.put(key + 1, cache.get(key) * factor)
+    cache.close()
+
+
+def test_lru_cache():
+    """
+    Runs the LeetCode example and randomized checks against the caches in this file.
+    """
+    for cls in (LRUCache, ArrayLRUCache):
+        cache = cls(2)
+        cache.put(1, 1)
+        cache.put(2, 2)
+        assert cache.get(1) == 1, f"{cls.__name__}: get(1) failed"
+        cache.put(3, 3)  # Evicts key 2
+        assert cache.get(2) == -1, f"{cls.__name__}: key 2 should be evicted"
+        cache.put(4, 4)  # Evicts key 1
+        assert cache.get(1) == -1, f"{cls.__name__}: key 1 should be evicted"
+        assert cache.get(3) == 3, f"{cls.__name__}: get(3) failed"
+        assert cache.get(4) == 4, f"{cls.__name__}: get(4) failed"
+        cache.put(4, 5)  # Overwrite
+        assert cache.get(4) == 5, f"{cls.__name__}: overwrite failed"
+
+    # Random operations must match the Node-based reference exactly
+    rng = random.Random(146)
+    ref, arr = LRUCache(50), ArrayLRUCache(50)
+    for _ in range(20000):
+        key = rng.randrange(120)
+        if rng.random() < 0.5:
+            assert ref.get(key) == arr.get(key), "ArrayLRUCache diverged on get"
+        else:
+            ref.put(key, key * 7)
+            arr.put(key, key * 7)
+
+    # Batch operations must leave the same state as looped single calls
+    for _ in range(200):
+        single, batch = LRUCache(30), LRUCache(30)
+        for _ in range(5):
+            keys = [rng.randrange(60) for _ in range(rng.randrange(1, 80))]
+            items = [(key, rng.randrange(1000)) for key in keys]
+            for key, value in items:
+                single.put(key, value)
+            batch.put_many(items)
+            keys = [rng.randrange(60) for _ in range(rng.randrange(1, 80))]
+            assert [single.get(key) for key in keys] == batch.get_many(keys), "get_many diverged"
+        assert list(single.cache) and len(single.cache) == len(batch.cache), "put_many evicted wrongly"
+        assert single.get_many(range(60)) == batch.get_many(range(60)), "Batch recency order diverged"
+
+    # Spare nodes are capped at capacity and hold no evicted payloads
+    batch = LRUCache(10)
+    for start in range(0, 5000, 500):
+        batch.put_many((key, [key]) for key in range(start, start + 500))
+        assert len(batch.spare) <= 10, "put_many spare pool grew past capacity"
+        assert all(node.key is None and node.val is None for node in batch.spare), "Spare kept payload"
+    assert batch.get_many(range(4990, 5000)) == [[key] for key in range(4990, 5000)]
+
+    # Every policy must respect capacity and return the latest value for resident keys
+    for name, cls in EVICTION_POLICIES.items():
+        cache, latest = cls(64), {}
+        for step in range(30000):
+            key = rng.randrange(300) if rng.random() < 0.7 else rng.randrange(20)
+            if rng.random() < 0.5:
+                value = cache.get(key)
+                assert value in (-1, latest.get(key)), f"{name}: stale value for {key}"
+            else:
+                cache.put(key, step)
+                latest[key] = step
+                assert cache.get(key) in (-1, step), f"{name}: put lost the new value"
+        resident = sum(1 for key in latest if cache.get(key) != -1)
+        assert resident <= 64, f"{name}: holds {resident} keys with capacity 64"
+
+    # A scan must not flush the hot set of the scan-resistant policies
+    for name in ("2q", "arc", "tinylfu"):
+        cache = EVICTION_POLICIES[name](100)
+        for _ in range(5):
+            for key in range(50):
+                if cache.get(key) == -1:
+                    cache.put(key, key)
+        for key in range(1000, 1500):
+            if cache.get(key) == -1:
+                cache.put(key, key)
+        survivors = sum(1 for key in range(50) if cache.get(key) != -1)
+        assert survivors >= 25, f"{name}: scan flushed the hot set ({survivors}/50 left)"
+
+    # TTL entries expire lazily, through the wheel, and before live entries are evicted
+    now = [0.0]
+    ttl = TTLLRUCache(3, tick=1.0, clock=lambda: now[0])
+    ttl.put(1, 1, ttl=5)
+    ttl.put(2, 2)  # Never expires
+    ttl.put(3, 3, ttl=500)
+    assert ttl.get(1) == 1, "TTL entry expired too early"
+    now[0] = 5.5
+    assert ttl.get(1) == -1, "TTL entry not expired on get"
+    ttl.put(1, 1, ttl=2)
+    now[0] = 10
+    ttl.put(4, 4)  # Full: key 1 has expired and must go before LRU key 2
+    assert ttl.get(2) == 2 and ttl.get(4) == 4, "Live entry evicted before an expired one"
+    now[0] = 501
+    assert ttl.expire() == 1 and len(ttl.cache) == 2, "Wheel did not expire the long TTL"
+    assert ttl.get(3) == -1, "Expired entry still readable"
+
+    # Randomized: wheel expiry must agree with a brute-force expiry check
+    ttl = TTLLRUCache(200, tick=0.5, budget=2, clock=lambda: now[0])
+    expiry = {}
+    for step in range(30000):
+        now[0] += rng.random() * 0.2
+        key = rng.randrange(400)
+        if rng.random() < 0.5:
+            value = ttl.get(key)
+            if key in expiry and expiry[key][1] <= now[0]:
+                assert value == -1, "Expired value returned"
+            elif value != -1:
+                assert value == expiry[key][0], "Wrong TTL value returned"
+        else:
+            life = rng.choice((1, 5, 30, 5000, None))
+            ttl.put(key, step, ttl=life)
+            expiry[key] = (step, float('inf') if life is None else now[0] + life)
+        assert len(ttl.cache) <= 200, "TTLLRUCache over capacity"
+    now[0] += 10000
+    ttl.expire()
+    assert all(n.expires is None or n.expires > now[0] for n in ttl.cache.values()), "Wheel missed an expiry"
+    assert ttl.wheel.count == sum(1 for n in ttl.cache.values() if n.expires is not None), "Wheel leaked nodes"
+
+    # Weighted cache evicts by total weight and rejects oversized entries
+    weighted = WeightedLRUCache(100, weigher=lambda key, value: len(value), max_entry_weight=60)
+    weighted.put(1, "a" * 40)
+    weighted.put(2, "b" * 40)
+    assert weighted.weight == 80, "Weight not tracked"
+    weighted.get(1)
+    weighted.put(3, "c" * 30)  # 110 > 100: evicts LRU key 2
+    assert weighted.get(2) == -1 and weighted.weight == 70, "Weighted eviction wrong"
+    weighted.put(1, "x" * 70)  # Oversized: rejected, old value for key 1 dropped
+    assert weighted.get(1) == -1 and weighted.weight == 30, "Oversized entry cached"
+    weighted.put(4, 1, weight=60)
+    weighted.put(5, 1, weight=20)  # 110 > 100: evicts key 3
+    assert weighted.get(3) == -1 and weighted.weight == 80, "Explicit weight ignored"
+    assert weighted.weight == sum(n.weight for n in weighted.cache.values()), "Weight total drifted"
+
+    # Concurrent misses on one key call the loader once (threads)
+    calls = []
+
+    def slow_loader(key):
+        calls.append(key)
+        time.sleep(0.05)
+        return key * 10
+
+    loading = LoadingCache(LRUCache(10))
+    results = []
+    workers = [threading.Thread(target=lambda: results.append(loading.get_or_load(7, slow_loader)))
+               for _ in range(16)]
+    for th in workers:
+        th.start()
+    for th in workers:
+        th.join()
+    assert calls == [7] and results == [70] * 16, "Threaded get_or_load was not single-flight"
+
+    def failing_loader(key):
+        raise KeyError(key)
+
+    try:
+        loading.get_or_load(8, failing_loader)
+        assert False, "Loader exception swallowed"
+    except KeyError:
+        pass
+    assert loading.get_or_load(8, slow_loader) == 80 and not loading.inflight, "Failed load was cached"
+
+    # Refresh-ahead keeps serving the old value while reloading in the background
+    now = [0.0]
+    versions = iter(range(1, 100))
+    loading = LoadingCache(TTLLRUCache(10, clock=lambda: now[0]), ttl=10, refresh_ahead=2)
+    assert loading.get_or_load(1, lambda key: next(versions)) == 1
+    now[0] = 9
+    assert loading.get_or_load(1, lambda key: next(versions)) == 1, "Refresh-ahead did not serve stale value"
+    loading.executor.shutdown(wait=True)
+    assert loading.get(1) == 2, "Refresh-ahead did not reload"
+
+    for wrapper in (LoadingCache, AsyncLoadingCache):
+        try:
+            wrapper(LRUCache(4), refresh_ahead=0.5)
+            assert False, f"{wrapper.__name__} accepted refresh_ahead without TTLs"
+        except ValueError:
+            pass
+
+    # A failed background reload is counted and the stale value is still served
+    loading = LoadingCache(TTLLRUCache(10, clock=lambda: now[0]), ttl=10, refresh_ahead=2)
+    assert loading.get_or_load(1, lambda key: 5) == 5
+    now[0] = 18
+    assert loading.get_or_load(1, failing_loader) == 5, "Failed refresh hid the cached value"
+    loading.executor.shutdown(wait=True)
+    assert loading.refresh_failures == 1 and not loading.inflight and loading.get(1) == 5, "Refresh failure lost"
+
+    # Concurrent misses on one key call the loader once (asyncio)
+    async def run_async():
+        calls.clear()
+
+        async def async_loader(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key * 10
+
+        cache = AsyncLoadingCache(LRUCache(10))
+        values = await asyncio.gather(*(cache.get_or_load(3, async_loader) for _ in range(16)))
+        assert calls == [3] and values == [30] * 16, "Async get_or_load was not single-flight"
+        assert await cache.get_or_load(3, async_loader) == 30 and calls == [3], "Async value not cached"
+
+        # A failed refresh task is retrieved by its done-callback, never reported as unhandled
+        async def async_failing_loader(key):
+            raise KeyError(key)
+
+        unhandled = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+        now[0] = 0
+        cache = AsyncLoadingCache(TTLLRUCache(10, clock=lambda: now[0]), ttl=10, refresh_ahead=2)
+        assert await cache.get_or_load(4, async_loader) == 40
+        now[0] = 9
+        assert await cache.get_or_load(4, async_failing_loader) == 40, "Failed async refresh hid the value"
+        await asyncio.sleep(0.01)
+        gc.collect()
+        assert cache.refresh_failures == 1 and not cache.inflight and not unhandled, "Async refresh failure lost"
+
+    asyncio.run(run_async())
+
+    # Instrumentation counts every outcome and samples latency
+    stats_cache = InstrumentedLRUCache(2, sample_every=1, time_list_ops=True)
+    stats_cache.put(1, 1)
+    stats_cache.put(2, 2)
+    stats_cache.get(1)
+    stats_cache.put(3, 3)  # Evicts key 2
+    stats_cache.put(3, 4)  # Overwrite
+    stats_cache.get(2)
+    snap = stats_cache.stats.snapshot(reset=True)
+    assert (snap["hits"], snap["misses"], snap["inserts"], snap["overwrites"], snap["evictions"]) == \
+        (1, 1, 3, 1, 1), f"Wrong counters: {snap}"
+    assert sum(snap["latency_histogram_ns"].values()) == 6 and snap["list_ns"] > 0, "Latency not sampled"
+    assert stats_cache.stats.snapshot()["hits"] == 0, "reset() did not clear counters"
+
+    # Snapshots round-trip contents and recency order, including into a smaller cache
+    import tempfile
+    source = LRUCache(100)
+    for key in range(150):
+        source.put(key, key * 3)
+    for key in (60, 55, 149, 70):
+        source.get(key)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lru.snap")
+        assert save_snapshot(source, path) == 100
+        restored = load_snapshot(path, capacity=100)
+        assert restored.get_many(range(150)) == source.get_many(range(150)), "Snapshot lost entries/order"
+        small = load_snapshot(path, capacity=3)
+        assert sorted(small.cache) == [55, 70, 149], "Smaller capacity must keep the MRU-most entries"
+        small.put(1, 1)  # Evicts 55, the LRU of the restored order
+        assert small.get(55) == -1 and small.get(1) == 1, "Restored recency order is wrong"
+
+        pid = save_snapshot_background(source, path + ".bg")
+        if pid is not None:
+            assert os.waitpid(pid, 0)[1] == 0, "Background snapshot failed"
+        assert load_snapshot(path + ".bg").get_many(range(150)) == source.get_many(range(150))
+
+    # Shared-memory cache matches a per-shard LRU reference, and is visible from another process
+    shared = SharedLRUCache(64, shards=4)
+    try:
+        refs = [LRUCache(shared.shard_cap) for _ in range(4)]
+        for _ in range(20000):
+            key = rng.randrange(-200, 200)
+            ref = refs[shared._locate(key)[0]]
+            if rng.random() < 0.5:
+                assert shared.get(key) == ref.get(key), "SharedLRUCache diverged on get"
+            else:
+                value = rng.randrange(-2**63, 2**63)
+                shared.put(key, value)
+                ref.put(key, value)
+        shared.put(10**12, 42)
+        child = multiprocessing.Process(target=_shared_worker, args=(shared, 10**12, 7))
+        child.start()
+        child.join()
+        assert child.exitcode == 0 and shared.get(10**12 + 1) == 42 * 7, "Other process not sharing the cache"
+    finally:
+        shared.close()
+        shared.unlink()
+
+    # lru_memoize: exact keys for unhashable args, -1 results cached, stats and clearing
+    evaluated = []
+
+    @lru_memoize(maxsize=2)
+    def delay(times, n, k=1):
+        evaluated.append((n, k))
+        return -1 if n > 3 else sum(w for _, _, w in times) + k
+
+    times = [[1, 2, 1], [2, 3, 2]]
+    assert delay(times, 3) == 4 and delay([[1, 2, 1], [2, 3, 2]], 3) == 4, "Frozen list key missed"
+    assert delay(times, 4) == -1 and delay(times, 4) == -1, "-1 result not memoized"
+    assert delay(times, 3, k=2) == 5 and delay(times, 3, 2) == 5, "Keyword call confused with positional"
+    assert evaluated == [(3, 1), (4, 1), (3, 2), (3, 2)], f"Unexpected evaluations: {evaluated}"
+    assert delay.cache_info() == CacheInfo(2, 4, 2, 2), f"Wrong cache_info: {delay.cache_info()}"
+    delay.cache_clear()
+    assert delay.cache_info() == CacheInfo(0, 0, 2, 0) and delay(times, 3) == 4 and len(evaluated) == 5
+
+    @lru_memoize
+    def square(x):
+        return x * x
+
+    assert square(12) == 144 and square(12) == 144 and square.cache_info().hits == 1, "Bare decorator failed"
+
+    # Frozen keys keep container types apart and accept dicts with mixed-type keys
+    @lru_memoize(maxsize=None)
+    def kind(value):
+        return type(value).__name__
+
+    assert [kind([1]), kind((1,)), kind({1}), kind(frozenset([1]))] == ["list", "tuple", "set", "frozenset"]
+    assert [kind([[1]]), kind([(1,)]), kind(([1],)), kind([[1], 2])] == ["list", "list", "tuple", "list"]
+    assert kind({1: "a", "b": [2]}) == "dict" and kind({"b": [2], 1: "a"}) == "dict", "Mixed-key dict failed"
+    assert kind.cache_info().misses == 9 and kind.cache_info().hits == 1, f"Wrong keys: {kind.cache_info()}"
+
+    # Concurrent hits and misses on a small memoized function keep the list consistent
+    @lru_memoize(maxsize=32)
+    def double(x):
+        return 2 * x
+
+    errors = []
+
+    def hammer(seed):
+        local = random.Random(seed)
+        try:
+            for _ in range(20000):
+                x = local.randrange(64)
+                assert double(x) == 2 * x, "Memoized value corrupted under threads"
+        except Exception as exc:  # Surface failures (e.g. a KeyError from a torn list) in the main thread
+            errors.append(exc)
+
+    workers = [threading.Thread(target=hammer, args=(seed,)) for seed in range(8)]
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Force frequent thread switches inside the wrapper
+    try:
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    finally:
+        sys.setswitchinterval(switch)
+    info = double.cache_info()
+    assert not errors, f"Threaded memoize failed: {errors[0]!r}"
+    assert info.hits + info.misses == 8 * 20000 and info.currsize == 32, f"Threaded stats off: {info}"
+
+    # Harness: report shape, loop trace defeats LRU, file traces load
+    report = run_benchmarks(["lru", "2q"], {"loop": make_trace("loop", 2000, loop_size=150)}, capacity=100,
+                            verbose=False)
+    lru_row, twoq_row = report["results"]
+    assert lru_row["hit_ratio"] == 0 and twoq_row["hit_ratio"] > 0, "Loop trace hit ratios unexpected"
+    scan = make_trace("scan", 500, n_keys=100, loop_size=150)
+    assert len(set(scan)) == 500 and min(scan) >= 100, "Scan trace repeated keys"
+    assert {"ops_per_sec", "p50_ns", "p99_ns", "peak_bytes"} <= set(lru_row), "Missing metrics"
+    json.dumps(report)  # Must be serializable
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.txt")
+        with open(path, "w") as f:
+            f.write("# key op\n1 get\n2\n\n1\nuser:7\n")
+        assert load_trace(path) == [1, 2, 1, "user:7"], "Trace file parsed wrongly"
+
+    # A sharded cache must still evict: 4 shards x 2 slots hold at most 8 keys
+    sharded = ShardedLRUCache(8, shards=4)
+    for key in range(100):
+        sharded.put(key, key)
+    assert sum(len(shard.cache) for shard in sharded.shards) <= 8, "ShardedLRUCache over capacity"
+    assert sharded.get(99) == 99, "ShardedLRUCache lost the MRU key"
+
+    # Concurrent writers must leave every segment consistent
+    sharded = ShardedLRUCache(1000, shards=8)
+    writers = [threading.Thread(target=lambda base=base: [sharded.put(base + k, k) for k in range(5000)])
+               for base in range(0, 40000, 5000)]
+    for th in writers:
+        th.start()
+    for th in writers:
+        th.join()
+    for shard in sharded.shards:
+        assert len(shard.cache) <= shard.cap, "ShardedLRUCache segment over capacity"
+    print("All LRU tests passed!")
+
+
+def benchmark_storage(sizes=(1_000_000, 5_000_000)):
+    """
+    Compares memory, garbage-collector cost and throughput of the Node-based and array-backed caches.
+
+    For each size n the cache is filled with n keys (timed with the collector on, as in production),
+    then one full `gc.collect()` is timed, then the cache is hit with n random gets and n puts of
+    new keys (every put evicts).
+    """
+    for n in sizes:
+        keys = list(range(n))
+        probes = [random.randrange(n) for _ in range(n)]
+        for cls in (LRUCache, ArrayLRUCache):
+            tracemalloc.start()
+            cache = cls(n)
+            for key in keys:
+                cache.put(key, key)
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del cache
+            gc.collect()
+
+            cache = cls(n)
+            start = time.perf_counter()
+            for key in keys:
+                cache.put(key, key)
+            fill = time.perf_counter() - start
+            start = time.perf_counter()
+            gc.collect()
+            pause = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for key in probes:
+                cache.get(key)
+            for key in keys:
+                cache.put(key + n, key)
+            elapsed = fill + time.perf_counter() - start
+            print(f"{cls.__name__:>14} n={n:>10,}: {memory / n:6.1f} B/entry, fill {fill:5.2f} s, "
+                  f"full gc {pause * 1e3:4.0f} ms, {3 * n / elapsed / 1e6:5.2f} M ops/s")
+            del cache
+
+
+def benchmark_put(n=1_000_000, capacity=100_000, classes=None):
+    """
+    Measures `put` throughput for a 90%-overwrite trace and a 100%-insert trace.
+
+    The cache is warmed to capacity first. In the overwrite trace 90% of puts hit a
+    resident key and 10% insert a fresh key; in the insert trace every put is a new key
+    (and therefore an eviction).
+    """
+    rng = random.Random(2)
+    fresh = iter(range(capacity, capacity + 2 * n))
+    overwrite = [rng.randrange(capacity) if rng.random() < 0.9 else next(fresh) for _ in range(n)]
+    insert = list(range(capacity + 2 * n, capacity + 3 * n))
+    for cls in classes or (LRUCache, ArrayLRUCache):
+        for name, trace in (("90% overwrite", overwrite), ("100% insert", insert)):
+            cache = cls(capacity)
+            for key in range(capacity):
+                cache.put(key, key)
+            start = time.perf_counter()
+            for key in trace:
+                cache.put(key, key)
+            elapsed = time.perf_counter() - start
+            print(f"{cls.__name__:>14} {name:>13}: {n / elapsed / 1e6:5.2f} M puts/s")
+
+
+def benchmark_threads(ops=400_000, n_keys=1_000_000, capacity=100_000,
+                      thread_counts=(1, 2, 4, 8, 16, 32)):
+    """
+    Measures aggregate get/put throughput from 1 to 32 threads on a zipfian trace,
+    for the global-lock baseline and the sharded cache.
+
+    Each thread replays its own slice of the trace: `get`, then `put` on a miss.
+    """
+    trace = zipf_keys(n_keys, ops, rng=random.Random(3))
+
+    def worker(cache, keys):
+        get, put = cache.get, cache.put
+        for key in keys:
+            if get(key) == -1:
+                put(key, key)
+
+    for cls in (LockedLRUCache, ShardedLRUCache):
+        for t in thread_counts:
+            cache = cls(capacity)
+            chunk = -(-ops // t)
+            threads = [threading.Thread(target=worker, args=(cache, trace[i * chunk:(i + 1) * chunk]))
+                       for i in range(t)]
+            start = time.perf_counter()
+            for th in threads:
+                th.start()
+            for th in threads:
+                th.join()
+            elapsed = time.perf_counter() - start
+            print(f"{cls.__name__:>15} threads={t:>2}: {ops / elapsed / 1e6:5.2f} M ops/s")
+
+
+def scan_trace(n_keys, count, hot_keys, scan_every, scan_length, rng=None):
+    """
+    Zipfian accesses over `hot_keys`, interrupted every `scan_every` ops by a sequential
+    scan of `scan_length` never-repeated cold keys (starting above `n_keys`).
+    """
+    rng = rng or random.Random(0)
+    hot = zipf_keys(hot_keys, count, rng=rng)
+    trace, cold = [], n_keys
+    for i, key in enumerate(hot):
+        if i and i % scan_every == 0:
+            trace.extend(range(cold, cold + scan_length))
+            cold += scan_length
+        trace.append(key)
+    return trace
+
+
+def benchmark_policies(capacity=10_000, ops=500_000):
+    """
+    Replays a zipfian trace and a zipf + sequential-scan trace against every eviction policy,
+    reporting hit rate and ops/sec. Each access is `get`, then `put` on a miss.
+    """
+    traces = {
+        "zipf": zipf_keys(100_000, ops, rng=random.Random(4)),
+        "zipf+scan": scan_trace(10**9, ops, 100_000, 50_000, 2 * capacity, rng=random.Random(4)),
+    }
+    for trace_name, trace in traces.items():
+        for name, cls in EVICTION_POLICIES.items():
+            cache = cls(capacity)
+            get, put = cache.get, cache.put
+            hits = 0
+            start = time.perf_counter()
+            for key in trace:
+                if get(key) == -1:
+                    put(key, key)
+                else:
+                    hits += 1
+            elapsed = time.perf_counter() - start
+            print(f"{trace_name:>9} {name:>7}: hit rate {hits / len(trace):6.2%}, "
+                  f"{len(trace) / elapsed / 1e6:5.2f} M ops/s")
+
+
+def benchmark_ttl(n_keys=1_000_000, ops=1_000_000, step=0.001, budgets=(2, 8, 10**9)):
+    """
+    Per-operation latency of `get` (+ `put` on miss) with 1M keys and mixed TTLs.
+
+    A simulated clock moves `step` seconds per op (1M ops = ~17 minutes), and TTLs are drawn
+    from 1 s .. 10 min plus "no TTL", so expirations happen throughout the run. A huge budget
+    shows what happens when housekeeping is not spread across calls.
+    """
+    rng = random.Random(5)
+    trace = [rng.randrange(n_keys) for _ in range(ops)]
+    ttls = [rng.choice((1, 10, 60, 600, None)) for _ in range(ops)]
+    now = [0.0]
+    candidates = [("LRUCache", lambda: LRUCache(n_keys))]
+    candidates += [(f"TTL budget={b}", lambda b=b: TTLLRUCache(n_keys, budget=b, clock=lambda: now[0]))
+                   for b in budgets]
+    for name, make in candidates:
+        now[0] = 0.0
+        cache = make()
+        ttl_put = isinstance(cache, TTLLRUCache)
+        latencies = []
+        clock = time.perf_counter_ns
+        for key, life in zip(trace, ttls):
+            now[0] += step
+            start = clock()
+            if cache.get(key) == -1:
+                if ttl_put:
+                    cache.put(key, key, life)
+                else:
+                    cache.put(key, key)
+            latencies.append(clock() - start)
+        latencies.sort()
+
+        def pct(q):
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] / 1000
+
+        print(f"{name:>22}: p50 {pct(0.5):5.1f} us, p99 {pct(0.99):5.1f} us, "
+              f"p99.9 {pct(0.999):6.1f} us, p99.99 {pct(0.9999):7.1f} us, "
+              f"max {latencies[-1] / 1000:8.1f} us, total {sum(latencies) / 1e9:5.2f} s")
+
+
+def benchmark_batches(capacity=100_000, total=1_000_000, batch_sizes=(10, 100, 1000)):
+    """
+    Compares `get_many` / `put_many` with looped `get` / `put` for several batch sizes.
+    Keys are uniform over 2x capacity, so about half the gets miss and half the puts evict.
+    """
+    rng = random.Random(8)
+    keys = [rng.randrange(2 * capacity) for _ in range(total)]
+    for size in batch_sizes:
+        batches = [keys[i:i + size] for i in range(0, total, size)]
+        item_batches = [[(key, key) for key in batch] for batch in batches]
+        cache = LRUCache(capacity)
+        start = time.perf_counter()
+        for batch, items in zip(batches, item_batches):
+            for key, value in items:
+                cache.put(key, value)
+            for key in batch:
+                cache.get(key)
+        looped = time.perf_counter() - start
+
+        cache = LRUCache(capacity)
+        start = time.perf_counter()
+        for batch, items in zip(batches, item_batches):
+            cache.put_many(items)
+            cache.get_many(batch)
+        batched = time.perf_counter() - start
+        print(f"batch={size:>4}: looped {2 * total / looped / 1e6:5.2f} M ops/s, "
+              f"batched {2 * total / batched / 1e6:5.2f} M ops/s ({looped / batched:4.2f}x)")
+
+
+def benchmark_stats(capacity=100_000, ops=1_000_000):
+    """
+    Overhead of instrumentation: plain LRUCache vs InstrumentedLRUCache at several sampling settings,
+    on uniform keys over 2x capacity (get, then put on miss).
+    """
+    rng = random.Random(9)
+    trace = [rng.randrange(2 * capacity) for _ in range(ops)]
+    candidates = [
+        ("LRUCache (stats off)", lambda: LRUCache(capacity)),
+        ("counters only", lambda: InstrumentedLRUCache(capacity, sample_every=0)),
+        ("sample 1/100", lambda: InstrumentedLRUCache(capacity, sample_every=100)),
+        ("sample every op", lambda: InstrumentedLRUCache(capacity, sample_every=1)),
+        ("1/100 + list time", lambda: InstrumentedLRUCache(capacity, sample_every=100, time_list_ops=True)),
+    ]
+    for name, make in candidates:
+        cache = make()
+        get, put = cache.get, cache.put
+        start = time.perf_counter()
+        for key in trace:
+            if get(key) == -1:
+                put(key, key)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>22}: {ops / elapsed / 1e6:5.2f} M ops/s")
+
+
+def benchmark_snapshot(n=5_000_000, path="lru_benchmark.snap"):
+    """
+    Times a blocking dump, the parent-side stall of a background (forked) dump, and a warm-start load
+    for an n-entry cache.
+    """
+    cache = LRUCache(n)
+    cache.put_many((key, key) for key in range(n))
+
+    start = time.perf_counter()
+    save_snapshot(cache, path)
+    print(f"save_snapshot ({n:,} entries, {os.path.getsize(path) / 2**20:.0f} MiB): "
+          f"{time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    pid = save_snapshot_background(cache, path)
+    stall = time.perf_counter() - start
+    if pid is not None:
+        os.waitpid(pid, 0)
+    print(f"save_snapshot_background: parent stalled {stall * 1000:.1f} ms, "
+          f"done after {time.perf_counter() - start:.2f} s")
+
+    del cache
+    start = time.perf_counter()
+    cache = load_snapshot(path)
+    print(f"load_snapshot: {time.perf_counter() - start:.2f} s ({len(cache.cache):,} entries)")
+    os.remove(path)
+
+
+def _benchmark_shared_worker(cache, capacity, trace, results):
+    """Replay `trace` (get, put on miss) against `cache`, or a private LRUCache if `cache` is None."""
+    private = cache is None
+    if private:
+        cache = LRUCache(capacity)
+    hits = 0
+    for key in trace:
+        if cache.get(key) == -1:
+            cache.put(key, key)
+        else:
+            hits += 1
+    results.put(hits)
+    if not private:
+        cache.close()
+
+
+def benchmark_shared(capacity=100_000, n_keys=1_000_000, ops=100_000, process_counts=(1, 4, 8, 32)):
+    """
+    Aggregate ops/sec and hit rate of N worker processes sharing one SharedLRUCache vs each
+    keeping its own LRUCache of the same capacity; plus the memory each setup needs.
+    """
+    traces = [zipf_keys(n_keys, ops, rng=random.Random(seed)) for seed in range(max(process_counts))]
+
+    tracemalloc.start()
+    cache = LRUCache(capacity)
+    cache.put_many((key, key) for key in range(capacity))
+    private_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del cache
+
+    for n in process_counts:
+        for mode in ("private", "shared"):
+            shared = SharedLRUCache(capacity) if mode == "shared" else None
+            results = multiprocessing.Queue()
+            workers = [multiprocessing.Process(target=_benchmark_shared_worker,
+                                               args=(shared, capacity, traces[i], results))
+                       for i in range(n)]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            hits = sum(results.get() for _ in workers)
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+            memory = shared.shm.size if shared else n * private_bytes
+            print(f"{mode:>7} x{n:>2}: {n * ops / elapsed / 1e6:5.2f} M ops/s, "
+                  f"hit rate {hits / (n * ops):6.2%}, cache memory {memory / 2**20:7.1f} MiB")
+            if shared:
+                shared.close()
+                shared.unlink()
+
+
+def benchmark_memoize(calls=500_000):
+    """
+    Per-call overhead of lru_memoize vs functools.lru_cache on cache hits, for the common argument shapes.
+    """
+    def identity(*args, **kwargs):
+        return 0
+
+    grid = [[1, 0, 1, 1]] * 4
+    shapes = {
+        "f(int)": ((7,), {}),
+        "f(int, int)": ((7, 8), {}),
+        "f(int, k=int)": ((7,), {"k": 8}),
+        "f(list of lists)": ((grid,), {}),
+    }
+    for name, (args, kwargs) in shapes.items():
+        for label, decorate in (("functools.lru_cache", functools.lru_cache(maxsize=128)),
+                                ("lru_memoize", lru_memoize(maxsize=128))):
+            if label == "functools.lru_cache" and name == "f(list of lists)":
+                print(f"{name:>17} {label:>19}: unsupported (unhashable argument)")
+                continue
+            f = decorate(identity)
+            f(*args, **kwargs)
+            start = time.perf_counter()
+            for _ in range(calls):
+                f(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>17} {label:>19}: {elapsed / calls * 1e9:6.0f} ns per hit")
+
+
+"""
+Trace-Replay Benchmark Harness
+------------------------------
+Goal: Measure any cache with the `get`/`put` API under realistic access patterns, and keep the numbers
+in a machine-readable form so they can be diffed between commits.
+
+Logic:
+1. Traces (`make_trace` / `load_trace`):
+   - "zipf": skewed popularity over `n_keys`.
+   - "scan": one sequential pass over `count` never-repeated keys starting at `n_keys`, so every access
+     is a cold miss for every policy (the pure insert + evict cost).
+   - "loop": cyclic access to `loop_size` keys; with `loop_size` > capacity plain LRU (and ARC, which
+     never builds ghost entries when `t1` alone fills the cache) gets zero hits.
+   - "mixed": zipf with periodic sequential scans (`scan_trace`).
+   - File: one access per line, first whitespace-separated token is the key (ints stay ints).
+2. Replay (`replay`):
+   - Each access is `get`, then `put` on a miss (cache-aside).
+   - Pass 1 measures throughput and hit ratio with no per-op instrumentation.
+   - Pass 2 times every operation with `perf_counter_ns` for p50 / p99 latency.
+   - Pass 3 builds a fresh cache under `tracemalloc` and reports the peak traced memory.
+     Passes 2 and 3 are separate so their overhead never leaks into ops/sec.
+3. Output:
+   - `run_benchmarks` returns and optionally writes JSON: environment (Python, platform, git commit)
+     plus one record per (cache, trace) pair.
+   - Command line: `python "LC #146 - LRU Cache.py" --caches lru,arc --traces zipf,loop --json out.json`.
+     With no arguments the file runs its tests, as before.
+"""
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+
+CACHE_CLASSES = {
+    **EVICTION_POLICIES,
+    "array": ArrayLRUCache,
+    "sharded": ShardedLRUCache,
+    "ttl": TTLLRUCache,
+    "instrumented": InstrumentedLRUCache,
+}
+
+
+def resolve_cache(name):
+    """Cache class from a short name in CACHE_CLASSES or a `module:Class` import path."""
+    if name in CACHE_CLASSES:
+        return CACHE_CLASSES[name]
+    module, _, attr = name.partition(":")
+    if not attr:
+        raise ValueError(f"Unknown cache {name!r}: use one of {sorted(CACHE_CLASSES)} or module:Class")
+    return getattr(importlib.import_module(module), attr)
+
+
+def make_trace(kind, count, n_keys=100_000, loop_size=None, seed=0):
+    """Synthetic access trace of `count` keys (see the harness notes for the kinds)."""
+    rng = random.Random(seed)
+    if kind == "zipf":
+        return zipf_keys(n_keys, count, rng=rng)
+    if kind == "scan":
+        return list(range(n_keys, n_keys + count))
+    if kind == "loop":
+        loop_size = loop_size or n_keys
+        return [i % loop_size for i in range(count)]
+    if kind == "mixed":
+        return scan_trace(n_keys, count, n_keys, max(1, count // 10), max(1, n_keys // 5), rng=rng)[:count]
+    raise ValueError(f"Unknown trace kind {kind!r}")
+
+
+def load_trace(path):
+    """Read a trace file: one access per line, the first token is the key."""
+    trace = []
+    with open(path) as f:
+        for line in f:
+            token = line.split(None, 1)[0] if line.strip() else None
+            if token is None or token.startswith("#"):
+                continue
+            trace.append(int(token) if token.lstrip("-").isdigit() else token)
+    return trace
+
+
+def replay(cls, capacity, trace):
+    """
+    Replay `trace` against fresh `cls(capacity)` instances.
+
+    Returns:
+        dict: hit_ratio, ops_per_sec, p50_ns, p99_ns, peak_bytes.
+    """
+    cache = cls(capacity)
+    get, put = cache.get, cache.put
+    hits = 0
+    start = time.perf_counter()
+    for key in trace:
+        if get(key) == -1:
+            put(key, key)
+        else:
+            hits += 1
+    elapsed = time.perf_counter() - start
+
+    cache = cls(capacity)
+    get, put = cache.get, cache.put
+    clock = time.perf_counter_ns
+    latencies = []
+    record = latencies.append
+    for key in trace:
+        t0 = clock()
+        if get(key) == -1:
+            put(key, key)
+        record(clock() - t0)
+    latencies.sort()
+
+    del cache, get, put
+    tracemalloc.start()
+    cache = cls(capacity)
+    for key in trace:
+        if cache.get(key) == -1:
+            cache.put(key, key)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    n = len(trace)
+    return {
+        "hit_ratio": hits / n if n else 0.0,
+        "ops_per_sec": n / elapsed if elapsed else 0.0,
+        "p50_ns": latencies[n // 2] if n else 0,
+        "p99_ns": latencies[min(n - 1, int(n * 0.99))] if n else 0,
+        "peak_bytes": peak,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(caches, traces, capacity, json_path=None, verbose=True):
+    """
+    Replay every trace against every cache.
+
+    Args:
+        caches (List[str]): Names understood by `resolve_cache`.
+        traces (Dict[str, List]): Trace name -> list of keys.
+        capacity (int): Capacity for every cache.
+        json_path (str): If given, the report is also written there as JSON.
+        verbose (bool): Print one line per result.
+    Returns:
+        dict: {"environment": {...}, "results": [{cache, trace, capacity, ops, ...metrics}]}.
+    """
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "git_commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": [],
+    }
+    for trace_name, trace in traces.items():
+        for name in caches:
+            metrics = replay(resolve_cache(name), capacity, trace)
+            report["results"].append({"cache": name, "trace": trace_name, "capacity": capacity,
+                                      "ops": len(trace), **metrics})
+            if verbose:
+                print(f"{trace_name:>10} {name:>12}: hit {metrics['hit_ratio']:6.2%}, "
+                      f"{metrics['ops_per_sec'] / 1e6:5.2f} M ops/s, p50 {metrics['p50_ns']:>6} ns, "
+                      f"p99 {metrics['p99_ns']:>6} ns, peak {metrics['peak_bytes'] / 2**20:7.1f} MiB")
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def main(argv=None):
+    """Command-line entry point for the trace-replay harness."""
+    parser = argparse.ArgumentParser(description="Replay key-access traces against cache implementations.")
+    parser.add_argument("--caches", default="lru", help="comma-separated names or module:Class paths")
+    parser.add_argument("--traces", default="zipf", help="comma-separated synthetic kinds and/or trace files")
+    parser.add_argument("--capacity", type=int, default=10_000)
+    parser.add_argument("--ops", type=int, default=500_000, help="length of synthetic traces")
+    parser.add_argument("--keys", type=int, default=100_000, help="key space of synthetic traces")
+    parser.add_argument("--loop-size", type=int, default=None, help="keys cycled by the loop trace")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="write the report to this file")
+    args = parser.parse_args(argv)
 
+    traces = {}
+    for spec in args.traces.split(","):
+        if os.path.exists(spec):
+            traces[os.path.basename(spec)] = load_trace(spec)
+        else:
+            traces[spec] = make_trace(spec, args.ops, args.keys, args.loop_size, args.seed)
+    return run_benchmarks(args.caches.split(","), traces, args.capacity, args.json)
 
 
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main()
+    else:
+        test_lru_cache()